@@ -0,0 +1,26 @@
+def serialize_post(post):
+    return {
+        'id': post.id,
+        'author': post.author.username,
+        'group': post.group.slug if post.group else None,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'image': post.image.url if post.image else None,
+    }
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'pub_date': comment.pub_date,
+    }
+
+
+def serialize_page(page, serializer):
+    return {
+        'results': [serializer(obj) for obj in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    }
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Описание',
+        )
+        cls.posts_amount = settings.API_PAGE_SIZE + 3
+        for number in range(cls.posts_amount):
+            Post.objects.create(
+                author=cls.user,
+                group=cls.group,
+                text=f'Пост {number}',
+            )
+        cls.post = Post.objects.latest('pub_date', 'pk')
+        Comment.objects.create(
+            author=cls.reader,
+            post=cls.post,
+            text='Комментарий',
+        )
+        Follow.objects.create(user=cls.reader, author=cls.user)
+        cls.anon = Client()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_are_paginated_by_cursor(self):
+        urls = (
+            reverse('api:index'),
+            reverse('api:group_list', args=(self.group.slug,)),
+            reverse('api:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.anon.get(url).json()
+                self.assertEqual(
+                    len(first['results']),
+                    settings.API_PAGE_SIZE,
+                )
+                self.assertEqual(first['results'][0]['id'], self.post.id)
+                self.assertIsNone(first['previous'])
+                second = self.anon.get(url, {'cursor': first['next']}).json()
+                self.assertEqual(
+                    len(second['results']),
+                    self.posts_amount - settings.API_PAGE_SIZE,
+                )
+                self.assertIsNone(second['next'])
+
+    def test_post_detail_with_comments(self):
+        response = self.anon.get(
+            reverse('api:post_detail', args=(self.post.id,)),
+        )
+        data = response.json()
+        self.assertEqual(data['post']['text'], self.post.text)
+        self.assertEqual(data['post']['group'], self.group.slug)
+        self.assertEqual(
+            [comment['author'] for comment in data['comments']['results']],
+            [self.reader.username],
+        )
+
+    def test_follow_feed_requires_login(self):
+        url = reverse('api:follow_index')
+        self.assertEqual(
+            self.anon.get(url).status_code,
+            HTTPStatus.UNAUTHORIZED,
+        )
+        self.client.force_login(self.reader)
+        data = self.client.get(url).json()
+        self.assertEqual(data['results'][0]['id'], self.post.id)
+
+    def test_missing_objects_return_json_404(self):
+        urls = (
+            reverse('api:post_detail', args=(0,)),
+            reverse('api:group_list', args=('missing',)),
+            reverse('api:profile', args=('missing',)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.anon.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+                self.assertIn('detail', response.json())
+
+    def test_caching_headers(self):
+        url = reverse('api:index')
+        response = self.anon.get(url)
+        self.assertIn(
+            f'max-age={settings.API_CACHE_MAX_AGE}',
+            response['Cache-Control'],
+        )
+        response = self.anon.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
+
+from api.serializers import serialize_comment, serialize_page, serialize_post
+from core.cache import versioned_etag
+from core.utils import CursorPaginator
+from posts import feeds, pages
+from posts.models import Group, Post
+
+User = get_user_model()
+
+COMPACT = {'separators': (',', ':'), 'ensure_ascii': False}
+
+
+def _response(data, status=HTTPStatus.OK):
+    return JsonResponse(data, status=status, json_dumps_params=COMPACT)
+
+
+def _not_found():
+    return _response({'detail': 'не найдено'}, HTTPStatus.NOT_FOUND)
+
+
+def _posts(request, queryset):
+    return _response(
+        serialize_page(
+            CursorPaginator(queryset, settings.API_PAGE_SIZE).get_page(
+                request.GET.get('cursor'),
+            ),
+            serialize_post,
+        ),
+    )
+
+
+@require_GET
+@cache_control(max_age=settings.API_CACHE_MAX_AGE)
+@versioned_etag(pages.INDEX_PAGE)
+def index(request):
+    return _posts(request, feeds.index_feed())
+
+
+@require_GET
+@cache_control(max_age=settings.API_CACHE_MAX_AGE)
+@versioned_etag(pages.group_page)
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).first()
+    if group is None:
+        return _not_found()
+    return _posts(request, feeds.group_feed(group))
+
+
+@require_GET
+@cache_control(max_age=settings.API_CACHE_MAX_AGE)
+@versioned_etag(pages.profile_page)
+def profile(request, username):
+    author = User.objects.filter(username=username).first()
+    if author is None:
+        return _not_found()
+    return _posts(request, feeds.profile_feed(author))
+
+
+@require_GET
+@cache_control(private=True, max_age=0)
+def follow_index(request):
+    if not request.user.is_authenticated:
+        return _response(
+            {'detail': 'требуется авторизация'},
+            HTTPStatus.UNAUTHORIZED,
+        )
+    return _posts(request, feeds.follow_feed(request.user))
+
+
+@require_GET
+@cache_control(max_age=settings.API_CACHE_MAX_AGE)
+@versioned_etag(pages.post_page)
+def post_detail(request, post_id):
+    post = (
+        Post.objects.select_related('author', 'group')
+        .filter(id=post_id)
+        .first()
+    )
+    if post is None:
+        return _not_found()
+    comments = CursorPaginator(
+        feeds.post_comments(post),
+        settings.COMMENTS_PAGE_SIZE,
+    ).get_page(request.GET.get('cursor'))
+    return _response(
+        {
+            'post': serialize_post(post),
+            'comments': serialize_page(comments, serialize_comment),
+        },
+    )
@@ -0,0 +1,105 @@
+import time
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
+
+from core import db
+
+
+def _version_key(namespace):
+    return f'page_version:{namespace}'
+
+
+def get_version(namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _set_versions(namespaces):
+    now = time.time_ns()
+    versions = cache.get_many(map(_version_key, namespaces))
+    cache.set_many(
+        {
+            _version_key(namespace): max(
+                now,
+                versions.get(_version_key(namespace), 0) + 1,
+            )
+            for namespace in namespaces
+        },
+        None,
+    )
+
+
+def bump(*namespaces):
+    """Меняет версию; версия — время последнего изменения в наносекундах.
+
+    Внутри транзакции версия меняется ещё раз после коммита: страница,
+    отрисованная до коммита по старым данным, иначе осталась бы в кеше
+    под новой версией.
+    """
+    _set_versions(namespaces)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_set_versions, namespaces))
+
+
+def _read_primary_if_fresh(version):
+    """Свежую версию реплика могла ещё не догнать: читаем с основной.
+
+    Иначе устаревшая страница попадёт в кэш и ETag под новой версией.
+    """
+    lag = settings.REPLICA_MAX_LAG_SECONDS * 10**9
+    if db.reading_from_replica() and time.time_ns() - version < lag:
+        db.set_replica_reads(False)
+
+
+def _resolve(namespace, args, kwargs):
+    if not callable(namespace):
+        return namespace
+    # От namespace зависит ключ кэша, поэтому он читается с основной базы.
+    with db.replica_reads(False):
+        return namespace(*args, **kwargs)
+
+
+def versioned_cache_page(timeout, namespace):
+    """cache_page, ключ которого меняется при каждом bump(namespace).
+
+    namespace может быть строкой или функцией от аргументов view.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            name = _resolve(namespace, args, kwargs)
+            version = get_version(name)
+            _read_primary_if_fresh(version)
+            cached = cache_page(timeout, key_prefix=f'{name}:{version}')
+            return cached(view)(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def versioned_etag(namespace):
+    """condition() с ETag из версии namespace и id пользователя.
+
+    Если namespace вернул None, ETag не ставится.
+    """
+
+    def etag(request, *args, **kwargs):
+        name = _resolve(namespace, args, kwargs)
+        if name is None:
+            return None
+        version = get_version(name)
+        _read_primary_if_fresh(version)
+        return f'{name}:{version}:{request.user.pk or 0}'
+
+    return condition(etag_func=etag)
@@ -0,0 +1,74 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+_state = threading.local()
+
+# Сессии пишутся на каждом входе, версии страниц в кеше database — при
+# каждой записи; их нельзя читать с отстающей реплики.
+PRIMARY_ONLY_APPS = ('sessions', 'django_cache')
+
+
+def set_replica_reads(enabled):
+    _state.replica = enabled
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Внутри блока чтение идёт с реплик, если они настроены.
+
+    replica_reads(False) временно возвращает чтение на основную базу.
+    """
+    previous = getattr(_state, 'replica', False)
+    set_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        set_replica_reads(previous)
+
+
+def reading_from_replica():
+    replica = getattr(_state, 'replica', False)
+    return bool(settings.DATABASE_REPLICAS) and replica
+
+
+class ReplicaRouter:
+    """Запись всегда в default, чтение — с реплики внутри replica_reads()."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            reading_from_replica()
+            and model._meta.app_label not in PRIMARY_ONLY_APPS
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """Настраивает только что открытое соединение SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые перестали отвечать."""
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
@@ -0,0 +1,148 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+BASELINE_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+}
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, pragmas, persistent, deadline, operation):
+        super().__init__()
+        self.path = path
+        self.pragmas = pragmas
+        self.persistent = persistent
+        self.deadline = deadline
+        self.operation = operation
+        self.done = 0
+        self.errors = 0
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def run(self):
+        connection = self.connect() if self.persistent else None
+        while time.perf_counter() < self.deadline:
+            current = connection or self.connect()
+            try:
+                self.operation(current, self.done)
+                self.done += 1
+            except sqlite3.OperationalError:
+                self.errors += 1
+            finally:
+                if connection is None:
+                    current.close()
+        if connection is not None:
+            connection.close()
+
+
+def read(connection, number):
+    connection.execute(
+        'SELECT id, text FROM bench WHERE author_id = ? '
+        'ORDER BY id DESC LIMIT 10',
+        (number % 100,),
+    ).fetchall()
+
+
+def write(connection, number):
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        connection.execute(
+            'INSERT INTO bench (author_id, text) VALUES (?, ?)',
+            (number % 100, 'x' * 200),
+        )
+    except sqlite3.Error:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность SQLite при параллельном чтении '
+        'и записи: без настроек, с SQLITE_PRAGMAS и с постоянными '
+        'соединениями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=3)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--rows', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        profiles = (
+            ('без настроек', BASELINE_PRAGMAS, False),
+            ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS, False),
+            ('SQLITE_PRAGMAS + CONN_MAX_AGE', settings.SQLITE_PRAGMAS, True),
+        )
+        self.stdout.write(
+            f'{"профиль":<32}{"чтений/с":>12}{"записей/с":>12}'
+            f'{"ошибок":>8}',
+        )
+        directory = tempfile.mkdtemp()
+        try:
+            for number, (name, pragmas, persistent) in enumerate(profiles):
+                path = os.path.join(directory, f'bench{number}.sqlite3')
+                self.prepare(path, pragmas, options['rows'])
+                reads, writes, errors = self.run(
+                    path,
+                    pragmas,
+                    persistent,
+                    options,
+                )
+                self.stdout.write(
+                    f'{name:<32}{reads:>12.0f}{writes:>12.0f}{errors:>8}',
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def prepare(self, path, pragmas, rows):
+        connection = sqlite3.connect(path, isolation_level=None)
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        connection.execute(
+            'CREATE TABLE bench (id INTEGER PRIMARY KEY, '
+            'author_id INTEGER NOT NULL, text TEXT NOT NULL)',
+        )
+        connection.execute('CREATE INDEX bench_author ON bench (author_id)')
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO bench (author_id, text) VALUES (?, ?)',
+            ((number % 100, 'x' * 200) for number in range(rows)),
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run(self, path, pragmas, persistent, options):
+        deadline = time.perf_counter() + options['seconds']
+        readers = [
+            Worker(path, pragmas, persistent, deadline, read)
+            for _ in range(options['readers'])
+        ]
+        writers = [
+            Worker(path, pragmas, persistent, deadline, write)
+            for _ in range(options['writers'])
+        ]
+        for worker in readers + writers:
+            worker.start()
+        for worker in readers + writers:
+            worker.join()
+        seconds = options['seconds']
+        return (
+            sum(worker.done for worker in readers) / seconds,
+            sum(worker.done for worker in writers) / seconds,
+            sum(worker.errors for worker in readers + writers),
+        )
@@ -0,0 +1,208 @@
+"""Метрики процесса в текстовом формате Prometheus.
+
+Каждый поток пишет в собственный набор счётчиков без блокировок,
+наборы всех потоков суммируются только при чтении метрик.
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import MemcachedCache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+METRICS = {
+    'yatube_http_requests_total': (
+        'counter',
+        'Число обработанных запросов',
+    ),
+    'yatube_http_request_duration_seconds': (
+        'histogram',
+        'Время обработки запроса',
+    ),
+    'yatube_db_queries_per_request': (
+        'histogram',
+        'Число SQL-запросов на HTTP-запрос',
+    ),
+    'yatube_db_query_duration_seconds_total': (
+        'counter',
+        'Суммарное время SQL-запросов',
+    ),
+    'yatube_cache_requests_total': (
+        'counter',
+        'Обращения к кешу по результату',
+    ),
+}
+
+_local = threading.local()
+_stores = weakref.WeakValueDictionary()
+_stores_lock = threading.Lock()
+_retired = {}
+
+
+class _Store:
+    __slots__ = ('values', '__weakref__')
+
+    def __init__(self):
+        self.values = {}
+
+
+def _finalize(values):
+    # Поток завершился: его значения переносятся в общий набор,
+    # чтобы счётчики оставались монотонными.
+    with _stores_lock:
+        _merge(_retired, values)
+
+
+def _store():
+    store = getattr(_local, 'store', None)
+    if store is None:
+        store = _local.store = _Store()
+        with _stores_lock:
+            _stores[id(store)] = store
+        weakref.finalize(store, _finalize, store.values)
+    return store.values
+
+
+def inc(name, labels, value=1):
+    values = _store()
+    key = (name, labels)
+    values[key] = values.get(key, 0) + value
+
+
+def observe(name, labels, value, buckets):
+    """Гистограмма — список: счётчики корзин, корзина сверх последней
+    границы, сумма, число наблюдений и сами границы.
+    """
+    values = _store()
+    key = (name, labels)
+    histogram = values.get(key)
+    if histogram is None:
+        histogram = values[key] = [0] * (len(buckets) + 4)
+        histogram[-1] = buckets
+    index = bisect_left(buckets, value)
+    histogram[index] += 1
+    histogram[-3] += value
+    histogram[-2] += 1
+
+
+def _merge(total, values):
+    for key, value in values.copy().items():
+        if isinstance(value, list):
+            merged = total.setdefault(key, [0] * (len(value) - 1) + [None])
+            for index, part in enumerate(value[:-1]):
+                merged[index] += part
+            merged[-1] = value[-1]
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def collect():
+    with _stores_lock:
+        total = _merge({}, _retired)
+        for store in list(_stores.values()):
+            _merge(total, store.values)
+    return total
+
+
+def reset():
+    with _stores_lock:
+        _retired.clear()
+        for store in list(_stores.values()):
+            store.values.clear()
+
+
+def _format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('"', '\\"')
+            .replace('\n', '\\n'),
+        )
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def render():
+    total = collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        series = sorted(
+            (labels, value)
+            for (metric, labels), value in total.items()
+            if metric == name
+        )
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+                continue
+            buckets, cumulative = value[-1], 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{_format_labels(labels, le=bound)} '
+                    f'{cumulative}',
+                )
+            lines.append(
+                f'{name}_bucket{_format_labels(labels, le="+Inf")} '
+                f'{value[-2]}',
+            )
+            lines.append(f'{name}_sum{_format_labels(labels)} {value[-3]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-2]}')
+    return '\n'.join(lines) + '\n'
+
+
+class QueryTimer:
+    """execute_wrapper, считающий SQL-запросы и их время."""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += time.perf_counter() - start
+
+
+class MetricsCacheMixin:
+    """Считает попадания и промахи кеша."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            inc('yatube_cache_requests_total', (('result', 'miss'),))
+            return default
+        inc('yatube_cache_requests_total', (('result', 'hit'),))
+        return value
+
+
+class MetricsLocMemCache(MetricsCacheMixin, LocMemCache):
+    pass
+
+
+class MetricsMemcachedCache(MetricsCacheMixin, MemcachedCache):
+    pass
+
+
+class MetricsDatabaseCache(MetricsCacheMixin, DatabaseCache):
+    pass
+
+
+_MISSING = object()
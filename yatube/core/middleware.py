@@ -0,0 +1,91 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core import db, metrics
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class MetricsMiddleware:
+    """Собирает время ответа и SQL-запросы по имени URL."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = metrics.QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        if view == 'metrics':
+            return response
+        labels = (('view', view),)
+        metrics.inc(
+            'yatube_http_requests_total',
+            labels
+            + (
+                ('method', request.method),
+                ('status', str(response.status_code)),
+            ),
+        )
+        metrics.observe(
+            'yatube_http_request_duration_seconds',
+            labels,
+            duration,
+            metrics.LATENCY_BUCKETS,
+        )
+        metrics.observe(
+            'yatube_db_queries_per_request',
+            labels,
+            timer.queries,
+            metrics.QUERY_BUCKETS,
+        )
+        metrics.inc(
+            'yatube_db_query_duration_seconds_total',
+            labels,
+            timer.duration,
+        )
+        return response
+
+
+class ReplicaMiddleware:
+    """Отправляет чтение GET-страниц из REPLICA_VIEWS на реплики.
+
+    После любого изменяющего запроса клиент получает cookie и следующие
+    REPLICA_PIN_SECONDS секунд читает с основной базы, чтобы видеть
+    свои изменения.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            db.set_replica_reads(False)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.resolver_match.view_name in settings.REPLICA_VIEWS
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        ):
+            db.set_replica_reads(True)
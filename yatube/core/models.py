@@ -23,3 +23,12 @@ class CreatedModel(models.Model):
     class Meta:
         abstract = True
         ordering = ('-pub_date',)
+
+
+class StoredFile(models.Model):
+    name = models.CharField('имя файла', max_length=255, primary_key=True)
+    references = models.PositiveIntegerField('число ссылок', default=0)
+
+    class Meta:
+        verbose_name = 'файл хранилища'
+        verbose_name_plural = 'файлы хранилища'
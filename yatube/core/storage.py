@@ -0,0 +1,87 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from sorl.thumbnail import delete as delete_thumbnails
+from sorl.thumbnail.images import ImageFile
+
+from core.models import StoredFile
+
+HASHED_NAME = re.compile(r'(?:^|/)([0-9a-f]{2})/\1[0-9a-f]{62}(?:\.\w+)?$')
+
+
+class HashedFileSystemStorage(FileSystemStorage):
+    """Хранит файлы под именем sha256 содержимого, одинаковые — один раз.
+
+    save() добавляет ссылку на файл, delete() убирает её; файл и его
+    миниатюры удаляются вместе с последней ссылкой. Хешированный файл
+    без строки StoredFile не удаляется: чьи на него ссылки, неизвестно.
+    """
+
+    def digest(self, content):
+        sha256 = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+        return sha256.hexdigest()
+
+    def hashed_name(self, name, digest):
+        directory = posixpath.dirname(name.replace('\\', '/'))
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, self.digest(content))
+        # Строка StoredFile заблокирована: параллельный delete() не удалит
+        # файл между проверкой и записью.
+        with transaction.atomic():
+            StoredFile.objects.select_for_update().get_or_create(name=name)
+            if not self.exists(name):
+                name = self._save(name, content)
+            StoredFile.objects.filter(name=name).update(
+                references=F('references') + 1,
+            )
+        return name
+
+    def add_reference(self, name, count=1):
+        """Учитывает ссылки на уже сохранённый файл, например из импорта.
+
+        Возвращает False, если такого файла в хранилище нет.
+        """
+        with transaction.atomic():
+            StoredFile.objects.select_for_update().get_or_create(name=name)
+            if not self.exists(name):
+                StoredFile.objects.filter(name=name, references=0).delete()
+                return False
+            StoredFile.objects.filter(name=name).update(
+                references=F('references') + count,
+            )
+        return True
+
+    def delete(self, name):
+        with transaction.atomic():
+            stored = (
+                StoredFile.objects.select_for_update()
+                .filter(name=name)
+                .first()
+            )
+            if stored is not None and stored.references > 1:
+                stored.references = F('references') - 1
+                stored.save(update_fields=['references'])
+                return
+            if stored is None and HASHED_NAME.search(name):
+                return
+            StoredFile.objects.filter(name=name).delete()
+            # Ключи миниатюр строятся от хранилища исходника.
+            delete_thumbnails(ImageFile(name, self), delete_file=False)
+            super().delete(name)
@@ -1,9 +1,135 @@
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
 
-def paginate(request, queryset, pagesize: int = settings.PAGE_SIZE):
-    return Paginator(queryset, pagesize).get_page(request.GET.get('page'))
+class CountedPaginator(Paginator):
+    def __init__(self, object_list, per_page, count):
+        super().__init__(object_list, per_page)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        return self._count() if callable(self._count) else self._count
+
+
+class CursorPage(Page):
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.cursor_param = paginator.cursor_param
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинация по (pub_date, id) без OFFSET и COUNT(*)."""
+
+    def __init__(self, object_list, per_page, cursor_param='cursor'):
+        super().__init__(object_list, per_page)
+        self.cursor_param = cursor_param
+
+    @staticmethod
+    def encode_cursor(direction, obj):
+        return urlsafe_base64_encode(
+            force_bytes(f'{direction}|{obj.pub_date.isoformat()}|{obj.pk}'),
+        )
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            direction, pub_date, pk = force_text(
+                urlsafe_base64_decode(cursor),
+            ).split('|')
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        if direction not in ('next', 'prev') or pub_date is None:
+            return None
+        return direction, pub_date, pk
+
+    def get_page(self, cursor):
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            rows = self._fetch(self.object_list, '-pub_date', '-pk')
+            return self._page(rows, has_next=self._more(rows))
+        direction, pub_date, pk = decoded
+        if direction == 'next':
+            rows = self._fetch(
+                self.object_list.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk),
+                ),
+                '-pub_date',
+                '-pk',
+            )
+            return self._page(
+                rows,
+                has_next=self._more(rows),
+                has_previous=True,
+            )
+        rows = self._fetch(
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk),
+            ),
+            'pub_date',
+            'pk',
+        )
+        has_previous = self._more(rows)
+        return self._page(
+            rows[: self.per_page][::-1],
+            has_next=True,
+            has_previous=has_previous,
+        )
+
+    def _fetch(self, queryset, *ordering):
+        return list(queryset.order_by(*ordering)[: self.per_page + 1])
+
+    def _more(self, rows):
+        return len(rows) > self.per_page
+
+    def _page(self, rows, has_next=False, has_previous=False):
+        rows = rows[: self.per_page]
+        return CursorPage(
+            rows,
+            self,
+            self.encode_cursor('next', rows[-1])
+            if rows and has_next
+            else None,
+            self.encode_cursor('prev', rows[0])
+            if rows and has_previous
+            else None,
+        )
+
+
+def paginate(
+    request,
+    queryset,
+    pagesize: int = settings.PAGE_SIZE,
+    count=None,
+):
+    view_name = getattr(request.resolver_match, 'view_name', None)
+    if view_name in settings.CURSOR_PAGINATED_VIEWS:
+        return CursorPaginator(queryset, pagesize).get_page(
+            request.GET.get('cursor'),
+        )
+    if count is None:
+        paginator = Paginator(queryset, pagesize)
+    else:
+        paginator = CountedPaginator(queryset, pagesize, count)
+    return paginator.get_page(request.GET.get('page'))
 
 
 def truncatechars(chars: str, trim: int = settings.TRUNCATE_CHARS):
@@ -0,0 +1,65 @@
+from django.core.management import call_command
+from django.db import connection
+
+REBUILD_COMMANDS = (
+    'backfill_feed',
+    'reconcile_stats',
+    'backfill_comment_counts',
+    'recount_posts',
+    'rebuild_search_index',
+    'rebuild_follow_graph',
+    'rebuild_trending',
+)
+
+
+def rebuild_derived(stdout):
+    """Пересобирает ленты, статистику и индекс после вставок без сигналов."""
+    for command in REBUILD_COMMANDS:
+        stdout.write(f'Запуск {command}...')
+        call_command(command, stdout=stdout)
+
+
+def _insert_sql(model, fields, rows_count=1):
+    quote = connection.ops.quote_name
+    columns = [model._meta.get_field(name).column for name in fields]
+    placeholders = '({})'.format(', '.join(['%s'] * len(columns)))
+    return 'INSERT INTO {} ({}) VALUES {}'.format(
+        quote(model._meta.db_table),
+        ', '.join(map(quote, columns)),
+        ', '.join([placeholders] * rows_count),
+    )
+
+
+def insert_rows(model, fields, rows):
+    """Вставляет готовые кортежи одним executemany, минуя ORM.
+
+    Значения уже должны быть в представлении базы, сигналы не вызываются.
+    """
+    with connection.cursor() as cursor:
+        cursor.executemany(_insert_sql(model, fields), rows)
+
+
+def insert_rows_returning_ids(model, fields, rows):
+    """Как insert_rows, но id выдаёт база и они возвращаются по порядку.
+
+    Вызывать внутри транзакции. В SQLite пишущая транзакция держит
+    блокировку, поэтому id одной вставки идут подряд и заканчиваются
+    last_insert_rowid(). В остальных базах используется RETURNING.
+    """
+    if not rows:
+        return []
+    pk = model._meta.pk
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(_insert_sql(model, fields), rows)
+            cursor.execute('SELECT last_insert_rowid()')
+            last = cursor.fetchone()[0]
+            return list(range(last - len(rows) + 1, last + 1))
+        cursor.execute(
+            '{} RETURNING {}'.format(
+                _insert_sql(model, fields, len(rows)),
+                connection.ops.quote_name(pk.column),
+            ),
+            [value for row in rows for value in row],
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'posts/includes/post.html'
+
+
+def card_key(post):
+    return (
+        f'post_card:{post.pk}:{post.updated.timestamp()}:'
+        f'{post.comments_count}'
+    )
+
+
+def render_cards(posts):
+    keys = {card_key(post): post for post in posts}
+    cards = cache.get_many(keys)
+    missing = {
+        key: render_to_string(CARD_TEMPLATE, {'post': post})
+        for key, post in keys.items()
+        if key not in cards
+    }
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_TIMEOUT)
+        cards.update(missing)
+    return [(post, mark_safe(cards[key])) for key, post in keys.items()]
+
+
+def forget_card(post):
+    cache.delete(card_key(post))
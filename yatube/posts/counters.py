@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count
+
+from posts import stats
+from posts.models import Group, Post
+
+User = get_user_model()
+
+ALL_POSTS_KEY = 'post_count:all'
+
+
+def _key(author_id=None, group_id=None):
+    if author_id is not None:
+        return f'post_count:author:{author_id}'
+    if group_id is not None:
+        return f'post_count:group:{group_id}'
+    return ALL_POSTS_KEY
+
+
+def post_count(author_id=None, group_id=None):
+    key = _key(author_id, group_id)
+    count = cache.get(key)
+    if count is None:
+        if author_id is not None:
+            count = stats.user_stats(User(pk=author_id)).posts_count
+        elif group_id is not None:
+            count = stats.group_stats(Group(pk=group_id)).posts_count
+        else:
+            count = Post.objects.count()
+        cache.set(key, count, settings.POST_COUNT_TIMEOUT)
+    return count
+
+
+def _incr(key, delta):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def post_added(post, delta=1):
+    _incr(ALL_POSTS_KEY, delta)
+    _incr(_key(author_id=post.author_id), delta)
+    if post.group_id is not None:
+        _incr(_key(group_id=post.group_id), delta)
+
+
+def post_removed(post):
+    post_added(post, delta=-1)
+
+
+def group_changed(old_group_id, new_group_id):
+    if old_group_id is not None:
+        _incr(_key(group_id=old_group_id), -1)
+    if new_group_id is not None:
+        _incr(_key(group_id=new_group_id), 1)
+
+
+def recount():
+    counts = {ALL_POSTS_KEY: Post.objects.count()}
+    for field in ('author', 'group'):
+        counts.update(
+            (_key(**{f'{field}_id': row[field]}), row['count'])
+            for row in Post.objects.filter(**{f'{field}__isnull': False})
+            .values(field)
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+    cache.set_many(counts, settings.POST_COUNT_TIMEOUT)
+    return len(counts)
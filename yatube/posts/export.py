@@ -0,0 +1,141 @@
+import csv
+import json
+import zipfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from posts.models import Comment
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'zip': 'application/zip',
+}
+CSV_FIELDS = (
+    'type',
+    'id',
+    'author',
+    'group',
+    'post',
+    'text',
+    'pub_date',
+    'image',
+)
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def export_records(author, chunk_size=settings.EXPORT_CHUNK_SIZE):
+    """Посты и комментарии автора в формате import_data."""
+    posts = author.posts.order_by('pub_date', 'pk').values_list(
+        'pk',
+        'group__slug',
+        'text',
+        'pub_date',
+        'image',
+    )
+    for pk, group, text, pub_date, image in posts.iterator(chunk_size):
+        yield {
+            'type': 'post',
+            'id': pk,
+            'author': author.username,
+            'group': group,
+            'text': text,
+            'pub_date': pub_date.isoformat(),
+            'image': image,
+        }
+    comments = (
+        Comment.objects.filter(author=author)
+        .order_by('pub_date', 'pk')
+        .values_list('post_id', 'text', 'pub_date')
+    )
+    for post_id, text, pub_date in comments.iterator(chunk_size):
+        yield {
+            'type': 'comment',
+            'post': post_id,
+            'author': author.username,
+            'text': text,
+            'pub_date': pub_date.isoformat(),
+        }
+
+
+def ndjson_stream(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+class _Buffer:
+    """Поток без seek для zipfile: take() отдаёт записанное с прошлого раза."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_stream(records):
+    writer = csv.DictWriter(_Echo(), CSV_FIELDS, extrasaction='ignore')
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(record)
+
+
+def zip_stream(author, chunk_size=settings.EXPORT_CHUNK_SIZE):
+    """Архив с posts.ndjson и картинками, собираемый на лету."""
+    return filter(None, _zip_chunks(author, chunk_size))
+
+
+def _zip_chunks(author, chunk_size):
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('posts.ndjson', 'w', force_zip64=True) as file:
+            for record in export_records(author, chunk_size):
+                file.write(
+                    (json.dumps(record, ensure_ascii=False) + '\n').encode(),
+                )
+                yield buffer.take()
+        images = (
+            author.posts.exclude(image='')
+            .values_list('image', flat=True)
+            .iterator(chunk_size)
+        )
+        for name in images:
+            if not default_storage.exists(name):
+                continue
+            with default_storage.open(name) as source, archive.open(
+                f'images/{name}',
+                'w',
+                force_zip64=True,
+            ) as target:
+                for chunk in iter(lambda: source.read(FILE_CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    yield buffer.take()
+    yield buffer.take()
+
+
+def stream(author, export_format):
+    if export_format == 'zip':
+        return zip_stream(author)
+    if export_format == 'csv':
+        return csv_stream(export_records(author))
+    return ndjson_stream(export_records(author))
@@ -0,0 +1,78 @@
+from django.conf import settings
+
+from posts.models import FeedItem, Follow, Post, UserStats
+
+
+def _bulk_insert(items):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= settings.FEED_BATCH_SIZE:
+            FeedItem.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FeedItem.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def push_post(post):
+    _bulk_insert(
+        FeedItem(user_id=user_id, post_id=post.id, pub_date=post.pub_date)
+        for user_id in Follow.objects.filter(
+            author_id=post.author_id,
+        )
+        .values_list('user_id', flat=True)
+        .iterator()
+    )
+
+
+def mark_ready(**filters):
+    UserStats.objects.filter(**filters).update(feed_ready=True)
+
+
+def add_follow(user_id, author_id):
+    """Раскладывает посты автора; первая подписка делает ленту полной."""
+    _bulk_insert(
+        FeedItem(user_id=user_id, post_id=post_id, pub_date=pub_date)
+        for post_id, pub_date in Post.objects.filter(author_id=author_id)
+        .values_list('id', 'pub_date')
+        .iterator()
+    )
+    if (
+        not Follow.objects.filter(user_id=user_id)
+        .exclude(author_id=author_id)
+        .exists()
+    ):
+        mark_ready(pk=user_id)
+
+
+def remove_follow(user_id, author_id):
+    FeedItem.objects.filter(
+        user_id=user_id,
+        post__author_id=author_id,
+    ).delete()
+
+
+def index_feed():
+    return Post.objects.select_related('author', 'group')
+
+
+def group_feed(group):
+    return group.posts.select_related('author', 'group')
+
+
+def profile_feed(author):
+    return author.posts.select_related('author', 'group')
+
+
+def post_comments(post):
+    return post.comments.select_related('author')
+
+
+def follow_feed(user):
+    """Пока подписки не разложены в FeedItem, лента строится по Follow."""
+    posts = index_feed()
+    if not UserStats.objects.filter(pk=user.pk, feed_ready=True).exists():
+        return posts.filter(author__following__user=user)
+    return posts.filter(feed_items__user=user).order_by(
+        '-feed_items__pub_date',
+    )
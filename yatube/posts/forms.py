@@ -1,5 +1,7 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
 
+from posts.images import process_upload
 from posts.models import Comment, Post
 
 
@@ -12,6 +14,12 @@ class PostForm(forms.ModelForm):
             'image',
         )
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if isinstance(image, UploadedFile):
+            return process_upload(image)
+        return image
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,139 @@
+"""Граф подписок в кэше: для каждого пользователя два отсортированных
+массива id — на кого он подписан и кто подписан на него.
+"""
+from array import array
+from bisect import bisect_left
+from itertools import groupby
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump, get_version
+from posts.models import Follow
+
+GRAPH_NAMESPACE = 'follow_graph'
+
+# AutoField — 32-битное целое со знаком: 4 байта на связь.
+TYPECODE = 'i'
+
+# Для направления: поле, по которому ищем, и поле со значениями.
+DIRECTIONS = {
+    'following': ('user_id', 'author_id'),
+    'followers': ('author_id', 'user_id'),
+}
+
+
+def _key(direction, user_id, version=None):
+    version = version or get_version(GRAPH_NAMESPACE)
+    return f'{GRAPH_NAMESPACE}:{version}:{direction}:{user_id}'
+
+
+def _load(direction, user_id):
+    owner, value = DIRECTIONS[direction]
+    return array(
+        TYPECODE,
+        Follow.objects.filter(**{owner: user_id})
+        .order_by(value)
+        .values_list(value, flat=True),
+    )
+
+
+def _get(direction, user_id):
+    key = _key(direction, user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = _load(direction, user_id)
+        cache.set(key, ids, settings.FOLLOW_GRAPH_TIMEOUT)
+    return ids
+
+
+def following(user_id):
+    return _get('following', user_id)
+
+
+def followers(user_id):
+    return _get('followers', user_id)
+
+
+def _contains(ids, value):
+    position = bisect_left(ids, value)
+    return position < len(ids) and ids[position] == value
+
+
+def follows(user_id, author_id):
+    return _contains(following(user_id), author_id)
+
+
+def mutuals(user_id):
+    """Пользователи, с которыми подписка взаимная."""
+    return array(
+        TYPECODE,
+        sorted(set(following(user_id)).intersection(followers(user_id))),
+    )
+
+
+def _update(user_id, author_id, change):
+    version = get_version(GRAPH_NAMESPACE)
+    for direction, owner, value in (
+        ('following', user_id, author_id),
+        ('followers', author_id, user_id),
+    ):
+        key = _key(direction, owner, version)
+        ids = cache.get(key)
+        # Незагруженный массив потом прочитается из таблицы целиком.
+        if ids is not None and change(ids, value):
+            cache.set(key, ids, settings.FOLLOW_GRAPH_TIMEOUT)
+
+
+def _insert(ids, value):
+    position = bisect_left(ids, value)
+    if position < len(ids) and ids[position] == value:
+        return False
+    ids.insert(position, value)
+    return True
+
+
+def _delete(ids, value):
+    position = bisect_left(ids, value)
+    if position == len(ids) or ids[position] != value:
+        return False
+    del ids[position]
+    return True
+
+
+def add(user_id, author_id):
+    _update(user_id, author_id, _insert)
+
+
+def remove(user_id, author_id):
+    _update(user_id, author_id, _delete)
+
+
+def rebuild():
+    """Строит граф заново под новой версией ключей.
+
+    Массивы пользователей без подписок не записываются: они пустые
+    и загрузятся при первом обращении. Старые ключи истекут сами.
+    """
+    bump(GRAPH_NAMESPACE)
+    version = get_version(GRAPH_NAMESPACE)
+    written = 0
+    for direction, (owner, value) in DIRECTIONS.items():
+        rows = (
+            Follow.objects.order_by(owner, value)
+            .values_list(owner, value)
+            .iterator()
+        )
+        batch = {}
+        for user_id, group in groupby(rows, key=lambda row: row[0]):
+            batch[_key(direction, user_id, version)] = array(
+                TYPECODE,
+                (row[1] for row in group),
+            )
+            if len(batch) >= settings.FOLLOW_GRAPH_BATCH_SIZE:
+                cache.set_many(batch, settings.FOLLOW_GRAPH_TIMEOUT)
+                written += len(batch)
+                batch = {}
+        cache.set_many(batch, settings.FOLLOW_GRAPH_TIMEOUT)
+        written += len(batch)
+    return written
@@ -0,0 +1,94 @@
+import os
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from PIL import Image, ImageOps
+
+FORMATS = {
+    'JPEG': ('.jpg', 'image/jpeg'),
+    'PNG': ('.png', 'image/png'),
+    'WEBP': ('.webp', 'image/webp'),
+    'GIF': ('.gif', 'image/gif'),
+}
+
+
+def _open(upload):
+    upload.seek(0)
+    image = Image.open(upload)
+    width, height = image.size
+    # Image.open читает только заголовок: размер известен до декодирования.
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            f'Слишком большое изображение: {width}×{height} пикселей',
+            code='too_many_pixels',
+        )
+    return image
+
+
+def _save_options(image, image_format):
+    options = {}
+    if image.info.get('icc_profile'):
+        options['icc_profile'] = image.info['icc_profile']
+    if image_format == 'JPEG':
+        options.update(
+            quality=settings.IMAGE_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+    elif image_format in ('PNG', 'GIF'):
+        options['optimize'] = True
+    elif image_format == 'WEBP':
+        options['quality'] = settings.IMAGE_QUALITY
+    return options
+
+
+def process_upload(upload):
+    """Проверяет, поворачивает, уменьшает и пересохраняет картинку.
+
+    Метаданные (EXIF, GPS) не переносятся. Анимированные картинки
+    только проверяются. Результат пишется во временный файл, который
+    уходит на диск после FILE_UPLOAD_MAX_MEMORY_SIZE байт.
+    """
+    try:
+        return _reencode(upload)
+    except (OSError, Image.DecompressionBombError):
+        # verify() пропускает, например, обрезанный JPEG: ошибку
+        # выдаёт только полное декодирование.
+        raise ValidationError(
+            'Не удалось прочитать изображение: файл повреждён',
+            code='invalid_image',
+        )
+
+
+def _reencode(upload):
+    with _open(upload) as image:
+        if getattr(image, 'is_animated', False):
+            upload.seek(0)
+            return upload
+        source_format = image.format
+        max_size = settings.IMAGE_MAX_SIZE
+        # Для JPEG декодер сразу уменьшает картинку в 2–8 раз.
+        image.draft('RGB', max_size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(max_size, Image.LANCZOS)
+        image_format = source_format if source_format in FORMATS else 'JPEG'
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        output = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+        )
+        image.save(
+            output,
+            image_format,
+            **_save_options(image, image_format),
+        )
+    name = upload.name
+    content_type = getattr(upload, 'content_type', None)
+    if image_format != source_format:
+        extension, content_type = FORMATS[image_format]
+        name = os.path.splitext(name)[0] + extension
+    size = output.tell()
+    output.seek(0)
+    return UploadedFile(output, name, content_type, size)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts import stats
+
+
+class Command(BaseCommand):
+    help = 'Заполняет счётчик комментариев у постов по данным в базе'
+
+    def handle(self, *args, **options):
+        updated = stats.recount_post_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено постов: {updated}'),
+        )
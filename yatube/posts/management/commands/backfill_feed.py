@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import feeds
+from posts.models import FeedItem, Follow, UserStats
+
+
+class Command(BaseCommand):
+    help = 'Заполняет ленту подписок по существующим подпискам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='очистить ленту перед заполнением',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            UserStats.objects.update(feed_ready=False)
+            FeedItem.objects.all().delete()
+        follows = Follow.objects.values_list('user_id', 'author_id')
+        for count, (user_id, author_id) in enumerate(
+            follows.iterator(),
+            start=1,
+        ):
+            with transaction.atomic():
+                feeds.add_follow(user_id, author_id)
+            if count % settings.FEED_BATCH_SIZE == 0:
+                self.stdout.write(f'Обработано подписок: {count}')
+        feeds.mark_ready()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в ленте: {FeedItem.objects.count()}'),
+        )
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации «кого почитать» по графу подписок '
+        '(запускается по расписанию, например из cron)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=settings.RECOMMENDATIONS_PER_USER,
+            help='сколько рекомендаций хранить на пользователя',
+        )
+
+    def handle(self, *args, **options):
+        created = recommendations.rebuild(options['limit'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Сохранено рекомендаций: {created}'),
+        )
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import export
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты и комментарии пользователя'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument(
+            '--format',
+            choices=tuple(export.FORMATS),
+            default='ndjson',
+        )
+        parser.add_argument(
+            '--output',
+            help='файл для выгрузки, по умолчанию stdout; zip можно '
+            'выгрузить в stdout, только если он двоичный',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден',
+            )
+        chunks = export.stream(author, options['format'])
+        if options['output']:
+            with open(options['output'], 'wb') as file:
+                self.write(file, chunks)
+            return
+        # OutputWrapper отдаёт атрибуты обёрнутого потока, в том числе
+        # двоичный buffer у sys.stdout.
+        binary = getattr(self.stdout, 'buffer', None)
+        if binary is not None:
+            self.write(binary, chunks)
+        elif options['format'] == 'zip':
+            raise CommandError('Для zip укажите --output')
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+
+    def write(self, file, chunks):
+        for chunk in chunks:
+            file.write(chunk.encode() if isinstance(chunk, str) else chunk)
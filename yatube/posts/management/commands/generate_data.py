@@ -0,0 +1,292 @@
+import random
+from datetime import timedelta
+from io import BytesIO
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from PIL import Image
+
+from core.cache import bump
+from posts.bulk import insert_rows, rebuild_derived
+from posts.models import Comment, Follow, Group, Post
+from posts.pages import GROUPS_PAGE, INDEX_PAGE, group_page, profile_page
+
+User = get_user_model()
+
+WORDS = (
+    'пост лента друг город утро вечер кофе книга фильм музыка дорога '
+    'море горы лес кот собака работа проект код релиз праздник погода '
+    'новость идея вопрос ответ история фото поездка дом семья спорт'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует воспроизводимый синтетический набор данных: '
+        'пользователей, группы, посты, комментарии и подписки'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--follows',
+            type=int,
+            default=20,
+            help='среднее число подписок на пользователя',
+        )
+        parser.add_argument(
+            '--images',
+            type=float,
+            default=0,
+            help='доля постов с картинкой, от 0 до 1',
+        )
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='synthetic')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.FEED_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--skip-rebuild',
+            action='store_true',
+            help='не пересобирать ленты, статистику и поисковый индекс',
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = options['days']
+        prefix = options['prefix']
+
+        user_ids = self.create_users(prefix, options['users'])
+        group_ids = self.create_groups(prefix, options['groups'])
+        post_ids = self.create_posts(
+            user_ids,
+            group_ids,
+            options['posts'],
+            options['images'],
+        )
+        self.create_comments(user_ids, post_ids, options['comments'])
+        self.create_follows(user_ids, options['follows'])
+
+        if not options['skip_rebuild']:
+            rebuild_derived(self.stdout)
+        bump(
+            INDEX_PAGE,
+            GROUPS_PAGE,
+            *(
+                profile_page(f'{prefix}_{number}')
+                for number in range(options['users'])
+            ),
+            *(
+                group_page(f'{prefix}-{number}')
+                for number in range(options['groups'])
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS('Готово'))
+
+    def zipf_weights(self, size, exponent=1.1):
+        return list(
+            accumulate(1 / (rank + 1) ** exponent for rank in range(size)),
+        )
+
+    def random_date(self):
+        return connection.ops.adapt_datetimefield_value(
+            self.now
+            - timedelta(seconds=self.rng.uniform(0, self.days * 86400)),
+        )
+
+    def random_text(self, low, high):
+        return ' '.join(
+            self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high))
+        ).capitalize()
+
+    def insert(self, model, objects, total, label, fields=None):
+        """Вставляет объекты пачками; с fields — готовые кортежи.
+
+        Посты и комментарии идут кортежами через insert_rows:
+        bulk_create перезаписал бы pub_date из-за auto_now_add.
+        """
+        batch, done = [], 0
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                done += self.flush(model, batch, fields)
+                self.stdout.write(f'{label}: {done}/{total}')
+                batch = []
+        if batch:
+            done += self.flush(model, batch, fields)
+            self.stdout.write(f'{label}: {done}/{total}')
+
+    def flush(self, model, batch, fields):
+        with transaction.atomic():
+            if fields:
+                insert_rows(model, fields, batch)
+            else:
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
+
+    def id_range(self, model, create):
+        before = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        create()
+        after = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        return range(before + 1, after + 1)
+
+    def create_users(self, prefix, amount):
+        password = make_password(None)
+        return self.id_range(
+            User,
+            lambda: self.insert(
+                User,
+                (
+                    User(
+                        username=f'{prefix}_{number}',
+                        first_name=self.rng.choice(WORDS).capitalize(),
+                        password=password,
+                    )
+                    for number in range(amount)
+                ),
+                amount,
+                'Пользователи',
+            ),
+        )
+
+    def create_groups(self, prefix, amount):
+        return self.id_range(
+            Group,
+            lambda: self.insert(
+                Group,
+                (
+                    Group(
+                        title=self.random_text(1, 3),
+                        slug=f'{prefix}-{number}',
+                        description=self.random_text(5, 20),
+                    )
+                    for number in range(amount)
+                ),
+                amount,
+                'Группы',
+            ),
+        )
+
+    def random_image(self, number):
+        file = BytesIO()
+        Image.new(
+            'RGB',
+            (64, 64),
+            tuple(self.rng.randrange(256) for _ in range(3)),
+        ).save(file, 'jpeg')
+        return default_storage.save(
+            f'posts/synthetic_{number}.jpg',
+            ContentFile(file.getvalue()),
+        )
+
+    def create_posts(self, user_ids, group_ids, amount, images):
+        if not user_ids:
+            return range(0)
+        authors = self.zipf_weights(len(user_ids))
+        updated = connection.ops.adapt_datetimefield_value(self.now)
+
+        def posts():
+            for number in range(amount):
+                (author_id,) = self.rng.choices(user_ids, cum_weights=authors)
+                yield (
+                    author_id,
+                    (
+                        self.rng.choice(group_ids)
+                        if group_ids and self.rng.random() < 0.5
+                        else None
+                    ),
+                    self.random_text(5, 60),
+                    self.random_date(),
+                    (
+                        self.random_image(number)
+                        if self.rng.random() < images
+                        else ''
+                    ),
+                    updated,
+                    0,
+                )
+
+        return self.id_range(
+            Post,
+            lambda: self.insert(
+                Post,
+                posts(),
+                amount,
+                'Посты',
+                (
+                    'author',
+                    'group',
+                    'text',
+                    'pub_date',
+                    'image',
+                    'updated',
+                    'comments_count',
+                ),
+            ),
+        )
+
+    def create_comments(self, user_ids, post_ids, amount):
+        if not user_ids or not post_ids:
+            return
+        self.insert(
+            Comment,
+            (
+                (
+                    self.rng.choice(user_ids),
+                    self.rng.choice(post_ids),
+                    self.random_text(1, 20),
+                    self.random_date(),
+                )
+                for _ in range(amount)
+            ),
+            amount,
+            'Комментарии',
+            ('author', 'post', 'text', 'pub_date'),
+        )
+
+    def create_follows(self, user_ids, average):
+        if len(user_ids) < 2:
+            return
+        popularity = self.zipf_weights(len(user_ids))
+        limit = len(user_ids) - 1
+        # Число подписок распределено по Парето, авторы выбираются по Ципфу:
+        # у немногих популярных авторов оказывается большинство подписчиков.
+        alpha = 1.5
+        scale = average * (alpha - 1) / alpha
+
+        def follows():
+            for user_id in user_ids:
+                wanted = min(int(scale * self.rng.paretovariate(alpha)), limit)
+                authors = set(
+                    self.rng.choices(
+                        user_ids,
+                        cum_weights=popularity,
+                        k=wanted,
+                    ),
+                )
+                authors.discard(user_id)
+                for author_id in sorted(authors):
+                    yield Follow(user_id=user_id, author_id=author_id)
+
+        self.insert(
+            Follow,
+            follows(),
+            len(user_ids) * average,
+            'Подписки (примерно)',
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.thumbnails import generate_renditions
+
+
+class Command(BaseCommand):
+    help = 'Создаёт миниатюры для уже загруженных картинок постов'
+
+    def handle(self, *args, **options):
+        post_ids = Post.objects.exclude(image='').values_list('id', flat=True)
+        for count, post_id in enumerate(post_ids.iterator(), start=1):
+            generate_renditions(post_id)
+            self.stdout.write(f'{count}: пост {post_id}')
@@ -0,0 +1,358 @@
+import csv
+import json
+import os
+import sys
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cache import bump
+from posts import pages
+from posts.bulk import (
+    insert_rows,
+    insert_rows_returning_ids,
+    rebuild_derived,
+)
+from posts.models import Comment, Follow, Group, ImportedPost, Post
+
+User = get_user_model()
+
+KINDS = ('user', 'group', 'post', 'comment', 'follow')
+# Кеши username, slug и внешних id; при промахе ключ снова ищется в базе.
+KEYS_LIMIT = 100_000
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует пользователей, группы, посты, комментарии '
+        'и подписки из NDJSON или CSV. Ссылки задаются username, slug '
+        'группы и внешним id поста. Импорт идёт пачками в отдельных '
+        'транзакциях и продолжается с места остановки через --offset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='файл или - для stdin')
+        parser.add_argument(
+            '--format',
+            choices=('ndjson', 'csv'),
+            help='по умолчанию определяется по расширению файла',
+        )
+        parser.add_argument(
+            '--type',
+            choices=KINDS,
+            help='тип записей CSV-файла без колонки type',
+        )
+        parser.add_argument(
+            '--source',
+            help='имя источника для внешних id постов, '
+            'по умолчанию имя файла',
+        )
+        parser.add_argument(
+            '--offset',
+            type=int,
+            default=0,
+            help='сколько записей пропустить при повторном запуске',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.FEED_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--skip-rebuild',
+            action='store_true',
+            help='не пересобирать ленты, статистику и поисковый индекс',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'ndjson'
+        )
+        self.source = options['source'] or os.path.basename(path)
+        self.users, self.groups, self.posts = {}, {}, {}
+        self.buffers = {kind: [] for kind in KINDS}
+        self.stats = Counter()
+        self.profiles, self.group_slugs = set(), set()
+
+        position = options['offset']
+        pending = 0
+        file = (
+            sys.stdin
+            if path == '-'
+            else open(path, encoding='utf-8', newline='')
+        )
+        try:
+            records = self.read(file, file_format, options['type'])
+            for record in islice(records, position, None):
+                position += 1
+                kind = record.get('type')
+                if kind not in self.buffers:
+                    self.stats['skipped'] += 1
+                    continue
+                self.parse_pub_date(record, position)
+                self.buffers[kind].append(record)
+                pending += 1
+                if pending >= options['batch_size']:
+                    self.flush(position)
+                    pending = 0
+            self.flush(position)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        if not options['skip_rebuild']:
+            rebuild_derived(self.stdout)
+        bump(
+            pages.INDEX_PAGE,
+            pages.GROUPS_PAGE,
+            *map(pages.profile_page, self.profiles),
+            *map(pages.group_page, self.group_slugs),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Готово: '
+                + ', '.join(
+                    f'{name} {count}'
+                    for name, count in sorted(self.stats.items())
+                ),
+            ),
+        )
+
+    def read(self, file, file_format, kind):
+        if file_format == 'csv':
+            for row in csv.DictReader(file):
+                if kind:
+                    row['type'] = kind
+                yield row
+            return
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise CommandError(f'Строка {number}: {error}')
+
+    def flush(self, position):
+        if not any(self.buffers.values()):
+            return
+        self.now = self.db_date(timezone.now())
+        with transaction.atomic():
+            for kind in KINDS:
+                rows, self.buffers[kind] = self.buffers[kind], []
+                if rows:
+                    getattr(self, f'insert_{kind}s')(rows)
+        for keys in (self.users, self.groups, self.posts):
+            if len(keys) > KEYS_LIMIT:
+                keys.clear()
+        self.stdout.write(f'Обработано записей: {position}')
+
+    def resolve(self, cache, queryset, field, keys, value='pk'):
+        missing = {key for key in keys if key and key not in cache}
+        if missing:
+            cache.update(
+                queryset.filter(**{f'{field}__in': missing}).values_list(
+                    field,
+                    value,
+                ),
+            )
+
+    def db_date(self, date):
+        return connection.ops.adapt_datetimefield_value(date)
+
+    def parse_pub_date(self, record, position):
+        value = record.get('pub_date')
+        try:
+            record['pub_date'] = parse_datetime(value) if value else None
+        except (TypeError, ValueError) as error:
+            raise CommandError(
+                f'Запись {position}: неверная дата {value!r}: {error}',
+            )
+
+    def pub_date(self, row):
+        date = row['pub_date']
+        if date is None:
+            return self.now
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date)
+        return self.db_date(date)
+
+    def insert_users(self, rows):
+        password = make_password(None)
+        User.objects.bulk_create(
+            (
+                User(
+                    username=row['username'],
+                    first_name=row.get('first_name') or '',
+                    last_name=row.get('last_name') or '',
+                    email=row.get('email') or '',
+                    password=row.get('password') or password,
+                )
+                for row in rows
+            ),
+            ignore_conflicts=True,
+        )
+        self.resolve(
+            self.users,
+            User.objects,
+            'username',
+            [row['username'] for row in rows],
+        )
+        self.stats['users'] += len(rows)
+
+    def insert_groups(self, rows):
+        Group.objects.bulk_create(
+            (
+                Group(
+                    title=row.get('title') or row['slug'],
+                    slug=row['slug'],
+                    description=row.get('description') or '',
+                )
+                for row in rows
+            ),
+            ignore_conflicts=True,
+        )
+        self.resolve(
+            self.groups,
+            Group.objects,
+            'slug',
+            [row['slug'] for row in rows],
+        )
+        self.stats['groups'] += len(rows)
+
+    def insert_posts(self, rows):
+        self.resolve(
+            self.users,
+            User.objects,
+            'username',
+            [row.get('author') for row in rows],
+        )
+        self.resolve(
+            self.groups,
+            Group.objects,
+            'slug',
+            [row.get('group') for row in rows],
+        )
+        self.resolve(
+            self.posts,
+            ImportedPost.objects.filter(source=self.source),
+            'key',
+            [str(row['id']) for row in rows if row.get('id')],
+            'post_id',
+        )
+        posts, keys, seen = [], [], set()
+        for row in rows:
+            key = str(row['id']) if row.get('id') else None
+            author_id = self.users.get(row.get('author'))
+            if author_id is None or key in self.posts or key in seen:
+                self.stats['posts skipped'] += 1
+                continue
+            group_id = self.groups.get(row.get('group'))
+            posts.append(
+                (
+                    author_id,
+                    group_id,
+                    row.get('text') or '',
+                    self.pub_date(row),
+                    row.get('image') or '',
+                    self.now,
+                    0,
+                ),
+            )
+            self.profiles.add(row['author'])
+            if group_id:
+                self.group_slugs.add(row['group'])
+            keys.append(key)
+            if key:
+                seen.add(key)
+        post_ids = insert_rows_returning_ids(
+            Post,
+            (
+                'author',
+                'group',
+                'text',
+                'pub_date',
+                'image',
+                'updated',
+                'comments_count',
+            ),
+            posts,
+        )
+        imported = []
+        for key, post_id in zip(keys, post_ids):
+            if key:
+                self.posts[key] = post_id
+                imported.append((self.source, key, post_id))
+        insert_rows(ImportedPost, ('source', 'key', 'post'), imported)
+        self.add_image_references(post[4] for post in posts)
+        self.stats['posts'] += len(posts)
+
+    def add_image_references(self, names):
+        """Импортированный пост ссылается на файл, как и загруженный."""
+        for name, count in Counter(filter(None, names)).items():
+            if not default_storage.add_reference(name, count):
+                self.stats['images missing'] += count
+
+    def insert_comments(self, rows):
+        self.resolve(
+            self.users,
+            User.objects,
+            'username',
+            [row.get('author') for row in rows],
+        )
+        self.resolve(
+            self.posts,
+            ImportedPost.objects.filter(source=self.source),
+            'key',
+            [str(row.get('post')) for row in rows],
+            'post_id',
+        )
+        comments = []
+        for row in rows:
+            author_id = self.users.get(row.get('author'))
+            post_id = self.posts.get(str(row.get('post')))
+            if author_id is None or post_id is None:
+                self.stats['comments skipped'] += 1
+                continue
+            comments.append(
+                (
+                    author_id,
+                    post_id,
+                    row.get('text') or '',
+                    self.pub_date(row),
+                ),
+            )
+        insert_rows(
+            Comment,
+            ('author', 'post', 'text', 'pub_date'),
+            comments,
+        )
+        self.stats['comments'] += len(comments)
+
+    def insert_follows(self, rows):
+        self.resolve(
+            self.users,
+            User.objects,
+            'username',
+            [row.get(field) for row in rows for field in ('user', 'author')],
+        )
+        follows = []
+        for row in rows:
+            user_id = self.users.get(row.get('user'))
+            author_id = self.users.get(row.get('author'))
+            if None in (user_id, author_id) or user_id == author_id:
+                self.stats['follows skipped'] += 1
+                continue
+            follows.append(Follow(user_id=user_id, author_id=author_id))
+            self.profiles.add(row['author'])
+        Follow.objects.bulk_create(follows, ignore_conflicts=True)
+        self.stats['follows'] += len(follows)
@@ -0,0 +1,359 @@
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from importlib import import_module
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    get_user_model,
+)
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from posts.models import Post
+
+User = get_user_model()
+
+DEFAULT_MIX = 'index=40,profile=25,follow=15,comment=15,post=5'
+SAMPLE_SIZE = 1000
+
+
+class WSGIClient:
+    """Вызывает WSGI-приложение напрямую, без сети."""
+
+    def __init__(self):
+        from yatube.wsgi import application
+
+        self.application = application
+
+    def request(self, method, path, body, headers):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+        }
+        for name, value in headers.items():
+            if name == 'Content-Type':
+                environ['CONTENT_TYPE'] = value
+            else:
+                environ['HTTP_' + name.upper().replace('-', '_')] = value
+        setup_testing_defaults(environ)
+        status = []
+
+        def start_response(line, response_headers, exc_info=None):
+            status.append(int(line.split()[0]))
+
+        result = self.application(environ, start_response)
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0]
+
+
+class HTTPClient:
+    """Ходит в запущенный сервер через сокет, по соединению на поток."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.local = threading.local()
+
+    def request(self, method, path, body, headers):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = HTTPConnection(
+                self.host,
+                self.port,
+                timeout=30,
+            )
+        try:
+            connection.request(method, path, body or None, headers)
+            response = connection.getresponse()
+            response.read()
+        except (ConnectionError, OSError):
+            connection.close()
+            self.local.connection = None
+            raise
+        return response.status
+
+
+def percentile(values, share):
+    """Перцентиль по методу ближайшего ранга."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(share * len(values)) - 1))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест: смешанный сценарий чтения и записи через '
+        'WSGI-приложение или HTTP, отчёт о перцентилях по URL'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='адрес запущенного сервера; без него запросы идут '
+            'в WSGI-приложение внутри процесса',
+        )
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='общее число запросов',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            help='вместо --requests: длительность в секундах',
+        )
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument(
+            '--mix',
+            default=DEFAULT_MIX,
+            help=f'веса сценариев, по умолчанию {DEFAULT_MIX}',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='файл для отчёта в JSON')
+        parser.add_argument(
+            '--baseline',
+            help='JSON-отчёт прошлого прогона для сравнения',
+        )
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            help='допустимый рост p95 в процентах относительно --baseline',
+        )
+
+    def handle(self, *args, **options):
+        self.scenarios = self.parse_mix(options['mix'])
+        self.client = (
+            HTTPClient(options['url']) if options['url'] else WSGIClient()
+        )
+        self.prepare(options['users'])
+        self.results = []
+        self.stop_at = (
+            time.perf_counter() + options['duration']
+            if options['duration']
+            else None
+        )
+        self.remaining = iter(range(options['requests']))
+        self.remaining_lock = threading.Lock()
+
+        threads = max(1, options['threads'])
+        started = time.perf_counter()
+        if threads == 1:
+            self.worker(options['seed'])
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(
+                    executor.map(
+                        self.worker,
+                        range(options['seed'], options['seed'] + threads),
+                    ),
+                )
+        elapsed = time.perf_counter() - started
+
+        report = self.report(options, threads, elapsed)
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+                file.write('\n')
+        if options['baseline']:
+            self.compare(
+                report,
+                options['baseline'],
+                options['max_regression'],
+            )
+
+    def parse_mix(self, mix):
+        scenarios = {}
+        for part in mix.split(','):
+            name, _, weight = part.partition('=')
+            if not hasattr(self, f'scenario_{name.strip()}'):
+                raise CommandError(f'Неизвестный сценарий: {name}')
+            try:
+                scenarios[name.strip()] = float(weight)
+            except ValueError:
+                raise CommandError(f'Неверный вес сценария: {part}')
+        return scenarios
+
+    def prepare(self, amount):
+        users = []
+        for number in range(amount):
+            user, _ = User.objects.get_or_create(username=f'loadtest_{number}')
+            users.append(user)
+        self.usernames = list(
+            User.objects.values_list('username', flat=True)[:SAMPLE_SIZE],
+        )
+        self.post_ids = list(
+            Post.objects.values_list('id', flat=True)[:SAMPLE_SIZE],
+        )
+        engine = import_module(settings.SESSION_ENGINE)
+        self.sessions = []
+        for user in users:
+            session = engine.SessionStore()
+            session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+            session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+            session.save()
+            self.sessions.append(session.session_key)
+
+    def next_request(self):
+        if self.stop_at is not None:
+            return time.perf_counter() < self.stop_at
+        with self.remaining_lock:
+            return next(self.remaining, None) is not None
+
+    def worker(self, seed):
+        rng = random.Random(seed)
+        names = list(self.scenarios)
+        weights = list(self.scenarios.values())
+        results = []
+        while self.next_request():
+            (name,) = rng.choices(names, weights)
+            scenario = getattr(self, f'scenario_{name}')
+            view_name, method, path, data = scenario(rng)
+            body, headers = b'', {}
+            if method == 'POST' or view_name == 'posts:follow_index':
+                csrf_token = get_random_string(64)
+                headers['Cookie'] = (
+                    f'{settings.SESSION_COOKIE_NAME}='
+                    f'{rng.choice(self.sessions)}; '
+                    f'{settings.CSRF_COOKIE_NAME}={csrf_token}'
+                )
+            if data is not None:
+                data['csrfmiddlewaretoken'] = csrf_token
+                body = urlencode(data).encode()
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            start = time.perf_counter()
+            try:
+                status = self.client.request(method, path, body, headers)
+            except OSError:
+                status = None
+            results.append((view_name, time.perf_counter() - start, status))
+        self.results.extend(results)
+
+    def scenario_index(self, rng):
+        return 'posts:index', 'GET', reverse('posts:index'), None
+
+    def scenario_profile(self, rng):
+        return (
+            'posts:profile',
+            'GET',
+            reverse('posts:profile', args=(rng.choice(self.usernames),)),
+            None,
+        )
+
+    def scenario_follow(self, rng):
+        return 'posts:follow_index', 'GET', reverse('posts:follow_index'), None
+
+    def scenario_comment(self, rng):
+        if not self.post_ids:
+            return self.scenario_index(rng)
+        return (
+            'posts:add_comment',
+            'POST',
+            reverse('posts:add_comment', args=(rng.choice(self.post_ids),)),
+            {'text': f'Нагрузочный комментарий {rng.random()}'},
+        )
+
+    def scenario_post(self, rng):
+        return (
+            'posts:post_create',
+            'POST',
+            reverse('posts:post_create'),
+            {'text': f'Нагрузочный пост {rng.random()}', 'group': ''},
+        )
+
+    def report(self, options, threads, elapsed):
+        by_view = {}
+        for view_name, latency, status in self.results:
+            by_view.setdefault(view_name, []).append((latency, status))
+        views = {}
+        for view_name, rows in sorted(by_view.items()):
+            latencies = sorted(latency for latency, _ in rows)
+            views[view_name] = {
+                'requests': len(rows),
+                'errors': sum(
+                    1 for _, status in rows if status is None or status >= 400
+                ),
+                'throughput': round(len(rows) / elapsed, 2),
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+                **{
+                    f'p{share}_ms': round(
+                        percentile(latencies, share / 100) * 1000,
+                        2,
+                    )
+                    for share in (50, 95, 99)
+                },
+            }
+        return {
+            'started': timezone.now().isoformat(),
+            'mode': 'http' if options['url'] else 'wsgi',
+            'threads': threads,
+            'mix': self.scenarios,
+            'seed': options['seed'],
+            'requests': len(self.results),
+            'elapsed_s': round(elapsed, 3),
+            'throughput': round(len(self.results) / elapsed, 2),
+            'views': views,
+        }
+
+    def print_report(self, report):
+        self.stdout.write(
+            f'{"URL":<22}{"запросов":>10}{"ошибок":>8}{"rps":>10}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}',
+        )
+        for view_name, row in report['views'].items():
+            self.stdout.write(
+                f'{view_name:<22}{row["requests"]:>10}{row["errors"]:>8}'
+                f'{row["throughput"]:>10}{row["p50_ms"]:>10}'
+                f'{row["p95_ms"]:>10}{row["p99_ms"]:>10}',
+            )
+        self.stdout.write(
+            f'Всего {report["requests"]} запросов за {report["elapsed_s"]} с, '
+            f'{report["throughput"]} запросов/с',
+        )
+
+    def compare(self, report, baseline_path, max_regression):
+        with open(baseline_path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = []
+        for view_name, row in report['views'].items():
+            before = baseline.get('views', {}).get(view_name)
+            if not before or not before['p95_ms']:
+                continue
+            change = (row['p95_ms'] / before['p95_ms'] - 1) * 100
+            self.stdout.write(
+                f'{view_name}: p95 {before["p95_ms"]} -> {row["p95_ms"]} мс '
+                f'({change:+.1f}%)',
+            )
+            if max_regression is not None and change > max_regression:
+                regressions.append(view_name)
+        if regressions:
+            raise CommandError(
+                'p95 вырос больше допустимого: ' + ', '.join(regressions),
+            )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts import graph
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает граф подписок в кэше из таблицы Follow'
+
+    def handle(self, *args, **options):
+        written = graph.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записано массивов подписок: {written}'),
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import search
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов и комментариев'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = search.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано документов: {indexed}'),
+        )
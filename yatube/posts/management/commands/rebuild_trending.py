@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг «в тренде» по постам и комментариям '
+        'за последние TRENDING_WINDOW'
+    )
+
+    def handle(self, *args, **options):
+        posts, groups = trending.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинг пересчитан: постов {posts}, групп {groups}',
+            ),
+        )
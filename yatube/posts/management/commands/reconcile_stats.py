@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import stats
+
+
+class Command(BaseCommand):
+    help = 'Сверяет статистику пользователей и групп с данными в базе'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = stats.reconcile()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено записей статистики: {fixed}'),
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts import counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает кэшированные счётчики постов '
+        '(запускается по расписанию, например из cron)'
+    )
+
+    def handle(self, *args, **options):
+        updated = counters.recount()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено счётчиков: {updated}'),
+        )
@@ -0,0 +1,92 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0013_auto_20261018_0156'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                (
+                    'group',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='stats',
+                        serialize=False,
+                        to='posts.Group',
+                        verbose_name='группа',
+                    ),
+                ),
+                (
+                    'posts_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='постов'
+                    ),
+                ),
+                (
+                    'comments_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='комментариев'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'статистика группы',
+                'verbose_name_plural': 'статистика групп',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                (
+                    'user',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='stats',
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='пользователь',
+                    ),
+                ),
+                (
+                    'posts_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='постов'
+                    ),
+                ),
+                (
+                    'followers_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='подписчиков'
+                    ),
+                ),
+                (
+                    'following_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='подписок'
+                    ),
+                ),
+                (
+                    'comments_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='комментариев'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'статистика пользователя',
+                'verbose_name_plural': 'статистика пользователей',
+            },
+        ),
+    ]
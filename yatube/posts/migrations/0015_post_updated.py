@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_groupstats_userstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated',
+            field=models.DateTimeField(
+                auto_now=True, verbose_name='дата изменения'
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from posts.search import get_backend
+
+    backend = get_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        for sql in backend.create_sql():
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    from posts.search import get_backend
+
+    backend = get_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        for sql in backend.drop_sql():
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_post_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedPost',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'source',
+                    models.CharField(max_length=100, verbose_name='источник'),
+                ),
+                (
+                    'key',
+                    models.CharField(
+                        max_length=100, verbose_name='внешний идентификатор'
+                    ),
+                ),
+                (
+                    'post',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='import_key',
+                        to='posts.Post',
+                        verbose_name='пост',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'импортированный пост',
+                'verbose_name_plural': 'импортированные посты',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedpost',
+            constraint=models.UniqueConstraint(
+                fields=('source', 'key'), name='unique_imported_post'
+            ),
+        ),
+    ]
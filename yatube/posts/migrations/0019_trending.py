@@ -0,0 +1,62 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingGroup',
+            fields=[
+                (
+                    'group',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='trending',
+                        serialize=False,
+                        to='posts.Group',
+                        verbose_name='группа',
+                    ),
+                ),
+                (
+                    'score',
+                    models.FloatField(db_index=True, verbose_name='рейтинг'),
+                ),
+            ],
+            options={
+                'verbose_name': 'рейтинг группы',
+                'verbose_name_plural': 'рейтинг групп',
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingPost',
+            fields=[
+                (
+                    'post',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='trending',
+                        serialize=False,
+                        to='posts.Post',
+                        verbose_name='пост',
+                    ),
+                ),
+                (
+                    'score',
+                    models.FloatField(db_index=True, verbose_name='рейтинг'),
+                ),
+            ],
+            options={
+                'verbose_name': 'рейтинг поста',
+                'verbose_name_plural': 'рейтинг постов',
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:34
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_group_activity(apps, schema_editor):
+    """То же, что stats.refresh_group_activity, на исторических моделях."""
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    Post = apps.get_model('posts', 'Post')
+    posts = (
+        Post.objects.filter(group=OuterRef('pk')).order_by().values('group')
+    )
+    GroupStats.objects.update(
+        authors_count=Coalesce(
+            Subquery(
+                posts.annotate(
+                    count=Count('author', distinct=True),
+                ).values('count'),
+            ),
+            0,
+        ),
+        last_post_at=Subquery(
+            posts.annotate(last=Max('pub_date')).values('last'),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_post_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupstats',
+            name='authors_count',
+            field=models.PositiveIntegerField(
+                default=0, verbose_name='авторов'
+            ),
+        ),
+        migrations.AddField(
+            model_name='groupstats',
+            name='last_post_at',
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name='последний пост'
+            ),
+        ),
+        migrations.RunPython(fill_group_activity, migrations.RunPython.noop),
+    ]
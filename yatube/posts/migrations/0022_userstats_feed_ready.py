@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0021_group_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='feed_ready',
+            field=models.BooleanField(
+                default=False, verbose_name='лента заполнена'
+            ),
+        ),
+    ]
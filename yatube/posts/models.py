@@ -32,6 +32,8 @@ class Post(CreatedModel):
         blank=True,
         help_text='загрузите изображение',
     )
+    updated = models.DateTimeField('дата изменения', auto_now=True)
+    comments_count = models.PositiveIntegerField('комментариев', default=0)
 
     class Meta(CreatedModel.Meta):
         default_related_name = 'posts'
@@ -77,3 +79,164 @@ class Follow(models.Model):
                 name='unique_following',
             ),
         ]
+
+
+class FeedItem(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed',
+        verbose_name='читатель',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_items',
+        verbose_name='пост',
+    )
+    pub_date = models.DateTimeField('дата публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'лента подписок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='unique_feed_item',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date'],
+                name='feed_user_pub_date_idx',
+            ),
+        ]
+
+
+class UserStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='пользователь',
+    )
+    posts_count = models.PositiveIntegerField('постов', default=0)
+    followers_count = models.PositiveIntegerField('подписчиков', default=0)
+    following_count = models.PositiveIntegerField('подписок', default=0)
+    comments_count = models.PositiveIntegerField('комментариев', default=0)
+    feed_ready = models.BooleanField('лента заполнена', default=False)
+
+    class Meta:
+        verbose_name = 'статистика пользователя'
+        verbose_name_plural = 'статистика пользователей'
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='группа',
+    )
+    posts_count = models.PositiveIntegerField('постов', default=0)
+    comments_count = models.PositiveIntegerField('комментариев', default=0)
+    authors_count = models.PositiveIntegerField('авторов', default=0)
+    last_post_at = models.DateTimeField(
+        'последний пост',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = 'статистика группы'
+        verbose_name_plural = 'статистика групп'
+
+
+class ImportedPost(models.Model):
+    source = models.CharField('источник', max_length=100)
+    key = models.CharField('внешний идентификатор', max_length=100)
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='import_key',
+        verbose_name='пост',
+    )
+
+    class Meta:
+        verbose_name = 'импортированный пост'
+        verbose_name_plural = 'импортированные посты'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'key'],
+                name='unique_imported_post',
+            ),
+        ]
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='рекомендуемый автор',
+    )
+    score = models.FloatField('вес')
+    mutual_count = models.PositiveIntegerField(
+        'подписок среди знакомых',
+        default=0,
+        help_text='сколько подписок пользователя читают этого автора',
+    )
+
+    class Meta:
+        verbose_name = 'рекомендация'
+        verbose_name_plural = 'рекомендации'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_recommendation',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-score'],
+                name='recommendation_user_score_idx',
+            ),
+        ]
+
+
+class TrendingPost(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='пост',
+    )
+    score = models.FloatField('рейтинг', db_index=True)
+
+    class Meta:
+        verbose_name = 'рейтинг поста'
+        verbose_name_plural = 'рейтинг постов'
+
+
+class TrendingGroup(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='группа',
+    )
+    score = models.FloatField('рейтинг', db_index=True)
+
+    class Meta:
+        verbose_name = 'рейтинг группы'
+        verbose_name_plural = 'рейтинг групп'
@@ -0,0 +1,54 @@
+from core.cache import bump
+from posts.models import Group, Post
+
+INDEX_PAGE = 'index'
+
+GROUPS_PAGE = 'groups'
+
+
+def group_page(slug):
+    return f'group:{slug}'
+
+
+def profile_page(username):
+    return f'profile:{username}'
+
+
+def post_page(post_id):
+    """Страница поста меняется вместе с профилем автора."""
+    username = (
+        Post.objects.filter(pk=post_id)
+        .values_list('author__username', flat=True)
+        .first()
+    )
+    return profile_page(username) if username else None
+
+
+def bump_profile_pages(*usernames):
+    bump(*map(profile_page, usernames))
+
+
+def bump_groups_page():
+    bump(GROUPS_PAGE)
+
+
+def bump_group_pages(*slugs):
+    """Название и описание группы есть и в каталоге, и на её странице."""
+    bump(GROUPS_PAGE, *map(group_page, set(slugs) - {None}))
+
+
+def bump_post_pages(post, *group_ids):
+    group_ids = {post.group_id, *group_ids} - {None}
+    if group_ids:
+        bump_groups_page()
+    bump(
+        INDEX_PAGE,
+        profile_page(post.author.username),
+        *map(
+            group_page,
+            Group.objects.filter(pk__in=group_ids).values_list(
+                'slug',
+                flat=True,
+            ),
+        ),
+    )
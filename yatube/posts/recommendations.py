@@ -0,0 +1,149 @@
+"""Рекомендации «кого почитать» по графу подписок.
+
+Граф — разреженная матрица смежности A в построчном виде: для каждого
+пользователя отсортированный список авторов, на которых он подписан.
+Вес кандидата c для пользователя u складывается из двух произведений:
+
+* (A·A)[u, c] — сколько авторов из подписок u читают c;
+* (A·Aᵀ·A)[u, c] — c читают пользователи с похожими подписками;
+  вклад каждого делится на число его подписок.
+"""
+import heapq
+from collections import Counter, defaultdict
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from posts import graph, pages
+from posts.models import Follow, Recommendation
+
+User = get_user_model()
+
+FRIEND_OF_FRIEND_WEIGHT = 1.0
+CO_FOLLOW_WEIGHT = 0.5
+
+
+def load_graph():
+    """Читает таблицу Follow одним запросом в строки и столбцы матрицы."""
+    rows = (
+        Follow.objects.order_by('user_id', 'author_id')
+        .values_list('user_id', 'author_id')
+        .iterator()
+    )
+    following = {
+        user_id: [author_id for _, author_id in group]
+        for user_id, group in groupby(rows, key=lambda row: row[0])
+    }
+    followers = defaultdict(list)
+    for user_id, authors in following.items():
+        for author_id in authors:
+            followers[author_id].append(user_id)
+    return following, followers
+
+
+def _similar_readers(user_id, following, followers):
+    """Строка (A·Aᵀ)[u]: читатели с общими подписками.
+
+    Авторы, у которых больше RECOMMENDATION_MAX_FANOUT подписчиков,
+    пропускаются: их читают все, и сходства это не говорит.
+    """
+    similar = Counter()
+    for author_id in following[user_id]:
+        readers = followers[author_id]
+        if len(readers) <= settings.RECOMMENDATION_MAX_FANOUT:
+            similar.update(readers)
+    del similar[user_id]
+    return similar
+
+
+def suggest(user_id, following, followers, limit):
+    """Лучшие limit кандидатов: кортежи (автор, вес, знакомых)."""
+    friends = Counter()
+    for author_id in following[user_id]:
+        friends.update(following.get(author_id, ()))
+    scores = Counter(
+        {
+            candidate: FRIEND_OF_FRIEND_WEIGHT * count
+            for candidate, count in friends.items()
+        },
+    )
+    similar = _similar_readers(user_id, following, followers)
+    for reader_id, shared in similar.items():
+        authors = following[reader_id]
+        weight = CO_FOLLOW_WEIGHT * shared / len(authors)
+        for candidate in authors:
+            scores[candidate] += weight
+    excluded = {user_id, *following[user_id]}
+    best = heapq.nlargest(
+        limit,
+        (
+            (score, candidate)
+            for candidate, score in scores.items()
+            if candidate not in excluded
+        ),
+    )
+    return [
+        (candidate, score, friends[candidate]) for score, candidate in best
+    ]
+
+
+def _usernames_with_recommendations():
+    return set(
+        User.objects.filter(
+            pk__in=Recommendation.objects.values('user_id'),
+        ).values_list('username', flat=True),
+    )
+
+
+def rebuild(limit=None):
+    """Пересчитывает таблицу рекомендаций целиком.
+
+    Расчёт идёт вне транзакции; блокировка на запись держится только
+    на замену строк таблицы.
+    """
+    limit = limit or settings.RECOMMENDATIONS_PER_USER
+    following, followers = load_graph()
+    rows = [
+        Recommendation(
+            user_id=user_id,
+            author_id=author_id,
+            score=score,
+            mutual_count=mutual_count,
+        )
+        for user_id in following
+        for author_id, score, mutual_count in suggest(
+            user_id,
+            following,
+            followers,
+            limit,
+        )
+    ]
+    with transaction.atomic():
+        usernames = _usernames_with_recommendations()
+        Recommendation.objects.all().delete()
+        Recommendation.objects.bulk_create(
+            rows,
+            batch_size=settings.RECOMMENDATIONS_BATCH_SIZE,
+        )
+        usernames |= _usernames_with_recommendations()
+    pages.bump_profile_pages(*usernames)
+    return len(rows)
+
+
+def for_user(user, limit=None):
+    """Готовые рекомендации без тех, на кого пользователь уже подписался."""
+    if not user.is_authenticated:
+        return []
+    limit = limit or settings.RECOMMENDATIONS_SHOWN
+    recommendations = (
+        Recommendation.objects.filter(user=user)
+        .select_related('author')
+        .order_by('-score')[: settings.RECOMMENDATIONS_PER_USER]
+    )
+    return [
+        recommendation
+        for recommendation in recommendations
+        if not graph.follows(user.id, recommendation.author_id)
+    ][:limit]
@@ -0,0 +1,228 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+
+from posts.models import Comment, Post
+
+POST_DOCUMENT, COMMENT_DOCUMENT = 0, 1
+
+
+def document_id(kind, pk):
+    return pk * 2 + kind
+
+
+class SQLiteSearchBackend:
+    table = 'posts_search'
+
+    def create_sql(self):
+        return [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+            'body, post_id UNINDEXED, '
+            "tokenize = 'unicode61 remove_diacritics 2')",
+        ]
+
+    def drop_sql(self):
+        return [f'DROP TABLE IF EXISTS {self.table}']
+
+    def match(self, query):
+        words = re.findall(r'\w+', query)
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def index(self, cursor, documents):
+        cursor.executemany(
+            f'DELETE FROM {self.table} WHERE rowid = %s',
+            [(doc_id,) for doc_id, _, _ in documents],
+        )
+        cursor.executemany(
+            f'INSERT INTO {self.table} (rowid, post_id, body) '
+            'VALUES (%s, %s, %s)',
+            documents,
+        )
+
+    def remove(self, cursor, doc_ids):
+        cursor.executemany(
+            f'DELETE FROM {self.table} WHERE rowid = %s',
+            [(doc_id,) for doc_id in doc_ids],
+        )
+
+    def clear(self, cursor):
+        cursor.execute(f'DELETE FROM {self.table}')
+
+    def search(self, cursor, query, limit, offset):
+        cursor.execute(
+            f'SELECT post_id, MIN(rank) AS score FROM {self.table} '
+            f'WHERE {self.table} MATCH %s '
+            'GROUP BY post_id ORDER BY score LIMIT %s OFFSET %s',
+            [self.match(query), limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def count(self, cursor, query):
+        cursor.execute(
+            f'SELECT COUNT(DISTINCT post_id) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s',
+            [self.match(query)],
+        )
+        return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend(SQLiteSearchBackend):
+    def create_sql(self):
+        return [
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'id bigint PRIMARY KEY, post_id integer NOT NULL, '
+            'document tsvector NOT NULL)',
+            f'CREATE INDEX IF NOT EXISTS {self.table}_document_idx '
+            f'ON {self.table} USING GIN (document)',
+        ]
+
+    def match(self, query):
+        return query
+
+    def index(self, cursor, documents):
+        cursor.executemany(
+            f'INSERT INTO {self.table} (id, post_id, document) '
+            'VALUES (%s, %s, to_tsvector(%s, %s)) '
+            'ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document',
+            [
+                (doc_id, post_id, settings.SEARCH_CONFIG, body)
+                for doc_id, post_id, body in documents
+            ],
+        )
+
+    def remove(self, cursor, doc_ids):
+        cursor.execute(
+            f'DELETE FROM {self.table} WHERE id = ANY(%s)',
+            [list(doc_ids)],
+        )
+
+    def search(self, cursor, query, limit, offset):
+        cursor.execute(
+            'SELECT post_id, MAX(ts_rank(document, query)) AS score '
+            f'FROM {self.table}, plainto_tsquery(%s, %s) query '
+            'WHERE document @@ query '
+            'GROUP BY post_id ORDER BY score DESC LIMIT %s OFFSET %s',
+            [settings.SEARCH_CONFIG, query, limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def count(self, cursor, query):
+        cursor.execute(
+            'SELECT COUNT(DISTINCT post_id) '
+            f'FROM {self.table}, plainto_tsquery(%s, %s) query '
+            'WHERE document @@ query',
+            [settings.SEARCH_CONFIG, query],
+        )
+        return cursor.fetchone()[0]
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend(vendor=None):
+    backend = BACKENDS.get(vendor or connection.vendor)
+    return backend() if backend else None
+
+
+def _index(documents):
+    backend = get_backend()
+    if backend is not None and documents:
+        with connection.cursor() as cursor:
+            backend.index(cursor, documents)
+
+
+def _remove(*doc_ids):
+    backend = get_backend()
+    if backend is not None:
+        with connection.cursor() as cursor:
+            backend.remove(cursor, doc_ids)
+
+
+def index_post(post):
+    _index([(document_id(POST_DOCUMENT, post.pk), post.pk, post.text)])
+
+
+def index_comment(comment):
+    _index(
+        [
+            (
+                document_id(COMMENT_DOCUMENT, comment.pk),
+                comment.post_id,
+                comment.text,
+            ),
+        ],
+    )
+
+
+def remove_post(post):
+    _remove(document_id(POST_DOCUMENT, post.pk))
+
+
+def remove_comment(comment):
+    _remove(document_id(COMMENT_DOCUMENT, comment.pk))
+
+
+def rebuild(batch_size=settings.SEARCH_BATCH_SIZE):
+    backend = get_backend()
+    if backend is None:
+        return 0
+    sources = (
+        (POST_DOCUMENT, Post.objects.values_list('pk', 'pk', 'text')),
+        (
+            COMMENT_DOCUMENT,
+            Comment.objects.values_list('pk', 'post_id', 'text'),
+        ),
+    )
+    indexed = 0
+    with connection.cursor() as cursor:
+        backend.clear(cursor)
+        for kind, rows in sources:
+            batch = []
+            for pk, post_id, text in rows.order_by().iterator():
+                batch.append((document_id(kind, pk), post_id, text))
+                if len(batch) >= batch_size:
+                    backend.index(cursor, batch)
+                    indexed += len(batch)
+                    batch = []
+            backend.index(cursor, batch)
+            indexed += len(batch)
+    return indexed
+
+
+class SearchResults:
+    """Ленивый список постов по запросу, пригодный для Paginator."""
+
+    def __init__(self, query):
+        self.query = query
+        self.backend = get_backend()
+
+    def count(self):
+        if not self.backend.match(self.query).strip():
+            return 0
+        with connection.cursor() as cursor:
+            return self.backend.count(cursor, self.query)
+
+    def __getitem__(self, page):
+        if not self.backend.match(self.query).strip():
+            return []
+        with connection.cursor() as cursor:
+            ids = self.backend.search(
+                cursor,
+                self.query,
+                page.stop - page.start,
+                page.start,
+            )
+        posts = Post.objects.select_related('author', 'group').in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(query):
+    if get_backend() is None:
+        return Post.objects.select_related('author', 'group').filter(
+            text__icontains=query,
+        )
+    return SearchResults(query)
@@ -0,0 +1,194 @@
+import logging
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import DEFERRED
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from posts import (
+    counters,
+    feeds,
+    graph,
+    pages,
+    search,
+    stats,
+    thumbnails,
+    trending,
+)
+from posts.models import Comment, Follow, Group, GroupStats, Post, UserStats
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        UserStats.objects.get_or_create(user=instance)
+
+
+@receiver(post_init, sender=Group)
+def group_initialized(sender, instance, **kwargs):
+    instance._initial_slug = instance.__dict__.get('slug')
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    if created:
+        GroupStats.objects.get_or_create(group=instance)
+    pages.bump_group_pages(instance.slug, instance._initial_slug)
+    instance._initial_slug = instance.slug
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    pages.bump_group_pages(instance.slug)
+
+
+@receiver(post_init, sender=Post)
+def post_initialized(sender, instance, **kwargs):
+    instance._initial_group_id = instance.__dict__.get('group_id', DEFERRED)
+    instance._initial_image = instance.__dict__.get('image', DEFERRED)
+
+
+def _delete_file(name):
+    try:
+        default_storage.delete(name)
+    except Exception:
+        logger.exception('Не удалось освободить файл %s', name)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, **kwargs):
+    instance._image_uploaded = bool(instance.image) and (
+        not instance.image._committed
+    )
+
+
+def _release_image(name):
+    if name:
+        transaction.on_commit(partial(_delete_file, name))
+
+
+def _image_changed(post, created):
+    if not post.image:
+        return False
+    if created:
+        return True
+    initial = post._initial_image
+    return initial is not DEFERRED and str(initial or '') != post.image.name
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        feeds.push_post(instance)
+        counters.post_added(instance)
+        stats.change_user(instance.author_id, posts_count=1)
+        stats.change_group(instance.group_id, posts_count=1)
+        stats.group_post_added(instance)
+        pages.bump_post_pages(instance)
+        trending.post_added(instance)
+    elif instance._initial_group_id not in (DEFERRED, instance.group_id):
+        counters.group_changed(instance._initial_group_id, instance.group_id)
+        comments = instance.comments.count()
+        stats.change_group(
+            instance._initial_group_id,
+            posts_count=-1,
+            comments_count=-comments,
+        )
+        stats.change_group(
+            instance.group_id,
+            posts_count=1,
+            comments_count=comments,
+        )
+        stats.refresh_group_activity(
+            instance._initial_group_id,
+            instance.group_id,
+        )
+        pages.bump_post_pages(instance, instance._initial_group_id)
+    else:
+        pages.bump_post_pages(instance)
+    search.index_post(instance)
+    if _image_changed(instance, created):
+        transaction.on_commit(
+            partial(thumbnails.schedule_renditions, instance.id),
+        )
+    if not created and instance._initial_image not in (
+        DEFERRED,
+        instance.image.name,
+    ):
+        _release_image(instance._initial_image)
+    elif (
+        not created
+        and instance._image_uploaded
+        and instance._initial_image == instance.image.name
+    ):
+        # Та же картинка загружена заново: save() хранилища добавил
+        # ссылку, которую пост не держит.
+        _release_image(instance.image.name)
+    instance._initial_group_id = instance.group_id
+    instance._initial_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    counters.post_removed(instance)
+    search.remove_post(instance)
+    stats.change_user(instance.author_id, posts_count=-1)
+    stats.change_group(instance.group_id, posts_count=-1)
+    stats.refresh_group_activity(instance.group_id)
+    pages.bump_post_pages(instance)
+    _release_image(instance.image.name)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.change_user(instance.author_id, comments_count=1)
+        stats.change_post(instance.post_id, comments_count=1)
+        stats.change_group(instance.post.group_id, comments_count=1)
+        trending.comment_added(instance)
+    search.index_comment(instance)
+    pages.bump_post_pages(instance.post)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    stats.change_user(instance.author_id, comments_count=-1)
+    stats.change_post(instance.post_id, comments_count=-1)
+    stats.change_group(instance.post.group_id, comments_count=-1)
+    search.remove_comment(instance)
+    pages.bump_post_pages(instance.post)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, **kwargs):
+    if created:
+        feeds.add_follow(instance.user_id, instance.author_id)
+        graph.add(instance.user_id, instance.author_id)
+        trending.follow_added(instance)
+        stats.change_user(instance.author_id, followers_count=1)
+        stats.change_user(instance.user_id, following_count=1)
+        pages.bump_profile_pages(
+            instance.author.username,
+            instance.user.username,
+        )
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    feeds.remove_follow(instance.user_id, instance.author_id)
+    graph.remove(instance.user_id, instance.author_id)
+    stats.change_user(instance.author_id, followers_count=-1)
+    stats.change_user(instance.user_id, following_count=-1)
+    pages.bump_profile_pages(instance.author.username, instance.user.username)
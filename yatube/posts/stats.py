@@ -0,0 +1,219 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Count,
+    DateTimeField,
+    F,
+    Max,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from posts.models import Comment, Follow, Group, GroupStats, Post, UserStats
+
+User = get_user_model()
+
+USER_COUNTERS = {
+    'posts_count': (Post, 'author'),
+    'followers_count': (Follow, 'author'),
+    'following_count': (Follow, 'user'),
+    'comments_count': (Comment, 'author'),
+}
+
+GROUP_COUNTERS = {
+    'posts_count': (Post, 'group'),
+    'comments_count': (Comment, 'post__group'),
+}
+
+
+def _exact(counters, pk):
+    return {
+        name: model.objects.filter(**{lookup: pk}).count()
+        for name, (model, lookup) in counters.items()
+    }
+
+
+def reconcile_user(user_id):
+    return UserStats.objects.update_or_create(
+        user_id=user_id,
+        defaults=_exact(USER_COUNTERS, user_id),
+    )[0]
+
+
+def reconcile_group(group_id):
+    stats = GroupStats.objects.update_or_create(
+        group_id=group_id,
+        defaults=_exact(GROUP_COUNTERS, group_id),
+    )[0]
+    refresh_group_activity(group_id)
+    stats.refresh_from_db()
+    return stats
+
+
+def user_stats(user):
+    try:
+        return user.stats
+    except UserStats.DoesNotExist:
+        user.stats = reconcile_user(user.id)
+        return user.stats
+
+
+def group_stats(group):
+    try:
+        return group.stats
+    except GroupStats.DoesNotExist:
+        group.stats = reconcile_group(group.id)
+        return group.stats
+
+
+def _change(model, pk, deltas):
+    if pk is None:
+        return
+    model.objects.filter(pk=pk).update(
+        **{
+            name: Greatest(F(name) + delta, 0)
+            for name, delta in deltas.items()
+        },
+    )
+
+
+def change_user(user_id, **deltas):
+    _change(UserStats, user_id, deltas)
+
+
+def change_group(group_id, **deltas):
+    _change(GroupStats, group_id, deltas)
+
+
+def change_post(post_id, **deltas):
+    _change(Post, post_id, deltas)
+
+
+def _group_activity():
+    posts = (
+        Post.objects.filter(group=OuterRef('pk')).order_by().values('group')
+    )
+    return {
+        'authors_count': Coalesce(
+            Subquery(
+                posts.annotate(
+                    count=Count('author', distinct=True),
+                ).values('count'),
+            ),
+            0,
+        ),
+        'last_post_at': Subquery(
+            posts.annotate(last=Max('pub_date')).values('last'),
+        ),
+    }
+
+
+def refresh_group_activity(*group_ids):
+    """Пересчитывает авторов и последний пост по постам этих групп."""
+    GroupStats.objects.filter(pk__in=set(group_ids) - {None}).update(
+        **_group_activity(),
+    )
+
+
+def group_post_added(post):
+    """Обновляет активность группы без пересчёта её постов."""
+    if post.group_id is None:
+        return
+    new_author = (
+        not Post.objects.filter(
+            group_id=post.group_id,
+            author_id=post.author_id,
+        )
+        .exclude(pk=post.pk)
+        .exists()
+    )
+    pub_date = Value(post.pub_date, output_field=DateTimeField())
+    GroupStats.objects.filter(pk=post.group_id).update(
+        authors_count=F('authors_count') + int(new_author),
+        last_post_at=Greatest(Coalesce('last_post_at', pub_date), pub_date),
+    )
+
+
+def group_directory():
+    return GroupStats.objects.select_related('group').order_by(
+        F('last_post_at').desc(nulls_last=True),
+        'group__title',
+    )
+
+
+def _reconcile_all(stats_model, owner_field, owners, counters):
+    exact = {
+        name: dict(
+            model.objects.filter(**{f'{lookup}__isnull': False})
+            .values_list(lookup)
+            .annotate(count=Count('pk'))
+            .order_by(),
+        )
+        for name, (model, lookup) in counters.items()
+    }
+    current = {
+        stats.pk: stats for stats in stats_model.objects.all().iterator()
+    }
+    to_create, to_update = [], []
+    for owner_id in owners.values_list('pk', flat=True).iterator():
+        values = {name: exact[name].get(owner_id, 0) for name in counters}
+        stats = current.get(owner_id)
+        if stats is None:
+            to_create.append(stats_model(**{owner_field: owner_id}, **values))
+        elif any(
+            getattr(stats, name) != value for name, value in values.items()
+        ):
+            for name, value in values.items():
+                setattr(stats, name, value)
+            to_update.append(stats)
+    stats_model.objects.bulk_create(
+        to_create,
+        batch_size=settings.STATS_BATCH_SIZE,
+    )
+    stats_model.objects.bulk_update(
+        to_update,
+        list(counters),
+        batch_size=settings.STATS_BATCH_SIZE,
+    )
+    return len(to_create) + len(to_update)
+
+
+def reconcile():
+    return (
+        _reconcile_all(
+            UserStats,
+            'user_id',
+            User.objects.all(),
+            USER_COUNTERS,
+        )
+        + _reconcile_group_stats()
+    )
+
+
+def _reconcile_group_stats():
+    fixed = _reconcile_all(
+        GroupStats,
+        'group_id',
+        Group.objects.all(),
+        GROUP_COUNTERS,
+    )
+    GroupStats.objects.update(**_group_activity())
+    return fixed
+
+
+def recount_post_comments():
+    """Пересчитывает Post.comments_count одним UPDATE."""
+    return Post.objects.update(
+        comments_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(count=Count('pk'))
+                .values('count'),
+            ),
+            0,
+        ),
+    )
@@ -0,0 +1,10 @@
+from django import template
+
+from posts.thumbnails import cached_rendition
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition(image, name):
+    return cached_rendition(image, name)
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from posts import cards
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostCardsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        for number in range(3):
+            Post.objects.create(author=cls.user, text=f'Пост {number}')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cards_are_fetched_with_one_get_many(self):
+        posts = list(Post.objects.select_related('author', 'group'))
+        cards.render_cards(posts)
+        with mock.patch.object(
+            cards,
+            'render_to_string',
+        ) as render, mock.patch.object(
+            cards.cache,
+            'get_many',
+            wraps=cards.cache.get_many,
+        ) as get_many:
+            rendered = cards.render_cards(posts)
+        render.assert_not_called()
+        get_many.assert_called_once()
+        self.assertEqual([post for post, _ in rendered], posts)
+
+    def test_only_changed_post_is_rerendered(self):
+        posts = list(Post.objects.select_related('author', 'group'))
+        cards.render_cards(posts)
+        changed = Post.objects.get(id=posts[0].id)
+        changed.text = 'Исправленный пост'
+        changed.save()
+        posts = list(Post.objects.select_related('author', 'group'))
+        with mock.patch.object(
+            cards,
+            'render_to_string',
+            wraps=cards.render_to_string,
+        ) as render:
+            rendered = dict(cards.render_cards(posts))
+        render.assert_called_once()
+        self.assertIn('Исправленный пост', rendered[changed])
@@ -0,0 +1,237 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from core.cache import get_version
+from posts import pages
+from posts.models import (
+    Comment,
+    FeedItem,
+    Follow,
+    Group,
+    ImportedPost,
+    Post,
+    UserStats,
+)
+
+User = get_user_model()
+
+
+class GenerateDataCommandTests(TestCase):
+    def generate(self, prefix, seed=1):
+        call_command(
+            'generate_data',
+            users=30,
+            groups=3,
+            posts=120,
+            comments=200,
+            follows=5,
+            seed=seed,
+            prefix=prefix,
+            batch_size=50,
+            stdout=StringIO(),
+        )
+        return list(
+            Post.objects.filter(author__username__startswith=prefix)
+            .order_by('id')
+            .values_list('author__username', 'group__slug', 'text'),
+        )
+
+    def test_generates_requested_volumes(self):
+        self.generate('gen')
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(Comment.objects.count(), 200)
+        self.assertTrue(Follow.objects.exists())
+        self.assertTrue(FeedItem.objects.exists())
+        self.assertEqual(UserStats.objects.count(), 30)
+        self.assertGreater(
+            len(set(Post.objects.values_list('pub_date', flat=True))),
+            1,
+        )
+
+    def test_cached_pages_are_invalidated(self):
+        names = (
+            pages.INDEX_PAGE,
+            pages.GROUPS_PAGE,
+            pages.group_page('gen-0'),
+            pages.profile_page('gen_0'),
+        )
+        before = [get_version(name) for name in names]
+        self.generate('gen')
+        for name, version in zip(names, before):
+            self.assertNotEqual(get_version(name), version, name)
+
+    def test_same_seed_gives_same_data(self):
+        first = self.generate('first')
+        second = self.generate('second')
+        self.assertEqual(
+            [
+                (author[6:], slug and slug[7:], text)
+                for author, slug, text in second
+            ],
+            [
+                (author[5:], slug and slug[6:], text)
+                for author, slug, text in first
+            ],
+        )
+
+
+class LoadtestCommandTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def test_report_is_written_per_url_name(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'report.json')
+            call_command(
+                'loadtest',
+                requests=40,
+                threads=1,
+                users=3,
+                output=output,
+                stdout=StringIO(),
+            )
+            with open(output, encoding='utf-8') as file:
+                report = json.load(file)
+        self.assertEqual(report['requests'], 40)
+        self.assertEqual(
+            sum(row['requests'] for row in report['views'].values()),
+            40,
+        )
+        for row in report['views'].values():
+            self.assertEqual(row['errors'], 0)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        self.assertTrue(
+            Comment.objects.filter(
+                author__username__startswith='loadtest_',
+            ).exists(),
+        )
+
+
+class ImportDataCommandTests(TestCase):
+    RECORDS = [
+        {'type': 'user', 'username': 'alice'},
+        {'type': 'user', 'username': 'bob'},
+        {'type': 'group', 'slug': 'cats', 'title': 'Коты'},
+        {
+            'type': 'post',
+            'id': 'p1',
+            'author': 'alice',
+            'group': 'cats',
+            'text': 'Первый пост',
+            'pub_date': '2020-01-01T10:00:00',
+        },
+        {'type': 'post', 'id': 'p2', 'author': 'bob', 'text': 'Второй'},
+        {'type': 'comment', 'post': 'p1', 'author': 'bob', 'text': 'Ого'},
+        {'type': 'comment', 'post': 'p9', 'author': 'bob', 'text': 'Нет'},
+        {'type': 'follow', 'user': 'bob', 'author': 'alice'},
+    ]
+
+    def run_import(self, records, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'dump.ndjson')
+            with open(path, 'w', encoding='utf-8') as file:
+                for record in records:
+                    file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            call_command('import_data', path, stdout=StringIO(), **options)
+
+    def test_records_are_imported_with_resolved_links(self):
+        self.run_import(self.RECORDS, batch_size=3)
+        post = Post.objects.get(import_key__key='p1')
+        self.assertEqual(post.author.username, 'alice')
+        self.assertEqual(post.group.slug, 'cats')
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertEqual(post.comments.get().author.username, 'bob')
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertTrue(
+            Follow.objects.filter(
+                user__username='bob',
+                author__username='alice',
+            ).exists(),
+        )
+        self.assertTrue(FeedItem.objects.filter(post=post).exists())
+        self.assertEqual(
+            UserStats.objects.get(user=post.author).posts_count,
+            1,
+        )
+
+    def test_database_assigns_post_ids(self):
+        existing = Post.objects.create(
+            author=User.objects.create_user(username='site'),
+            text='С сайта',
+        )
+        records = self.RECORDS + [
+            {'type': 'post', 'author': 'alice', 'text': 'Без id'},
+        ]
+        self.run_import(records, batch_size=4)
+        self.assertEqual(
+            Post.objects.get(import_key__key='p2').text,
+            'Второй',
+        )
+        self.assertTrue(Post.objects.filter(text='Без id').exists())
+        created = Post.objects.create(author=existing.author, text='После')
+        others = Post.objects.exclude(pk=created.pk).values_list('id')
+        self.assertGreater(created.id, max(others)[0])
+
+    def test_groups_page_is_invalidated(self):
+        before = get_version(pages.GROUPS_PAGE)
+        self.run_import(self.RECORDS)
+        self.assertNotEqual(get_version(pages.GROUPS_PAGE), before)
+
+    def test_key_caches_are_bounded(self):
+        with mock.patch(
+            'posts.management.commands.import_data.KEYS_LIMIT',
+            0,
+        ):
+            self.run_import(self.RECORDS, batch_size=1)
+        post = Post.objects.get(import_key__key='p1')
+        self.assertEqual(post.author.username, 'alice')
+        self.assertEqual(post.group.slug, 'cats')
+        self.assertEqual(post.comments.get().author.username, 'bob')
+
+    def test_invalid_date_reports_record_position(self):
+        records = self.RECORDS[:2] + [
+            {
+                'type': 'post',
+                'author': 'bob',
+                'pub_date': '2020-13-01T10:00:00',
+            },
+        ]
+        with self.assertRaisesMessage(CommandError, 'Запись 3'):
+            self.run_import(records)
+
+    def test_rerun_from_offset_does_not_duplicate(self):
+        self.run_import(self.RECORDS[:4], batch_size=2)
+        self.run_import(self.RECORDS, batch_size=2, offset=3)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(ImportedPost.objects.count(), 2)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_csv_with_type_option(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('username,first_name\ncarol,Кэрол\ndave,\n')
+            call_command(
+                'import_data',
+                path,
+                type='user',
+                skip_rebuild=True,
+                stdout=StringIO(),
+            )
+        self.assertEqual(
+            User.objects.get(username='carol').first_name,
+            'Кэрол',
+        )
+        self.assertTrue(User.objects.filter(username='dave').exists())
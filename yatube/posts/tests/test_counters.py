@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts import counters
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.anon = Client()
+        cls.group, cls.other_group = mixer.cycle(2).blend('posts.Group')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counts_follow_post_writes(self):
+        self.assertEqual(counters.post_count(author_id=self.user.id), 1)
+        self.assertEqual(counters.post_count(group_id=self.group.id), 1)
+        post = Post.objects.create(author=self.user, text='Ещё пост')
+        self.assertEqual(counters.post_count(author_id=self.user.id), 2)
+        self.assertEqual(counters.post_count(), 2)
+        post.delete()
+        self.assertEqual(counters.post_count(author_id=self.user.id), 1)
+        self.assertEqual(counters.post_count(), 1)
+
+    def test_group_change_moves_count(self):
+        counters.post_count(group_id=self.group.id)
+        counters.post_count(group_id=self.other_group.id)
+        post = Post.objects.get(id=self.post.id)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(counters.post_count(group_id=self.group.id), 0)
+        self.assertEqual(counters.post_count(group_id=self.other_group.id), 1)
+
+    def test_profile_reads_cached_count(self):
+        counters.post_count(author_id=self.user.id)
+        with self.assertNumQueries(2):
+            response = self.anon.get(
+                reverse('posts:profile', args=(self.user.username,)),
+            )
+        self.assertEqual(response.context['author'].stats.posts_count, 1)
+
+    def test_recount_command_fixes_drift(self):
+        cache.set(counters._key(author_id=self.user.id), 42)
+        call_command('recount_posts', stdout=StringIO())
+        self.assertEqual(counters.post_count(author_id=self.user.id), 1)
@@ -0,0 +1,45 @@
+import io
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.db import check_connections
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_pragmas_are_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(
+                cursor.fetchone()[0],
+                int(settings.SQLITE_PRAGMAS['busy_timeout']),
+            )
+
+    @override_settings(DB_HEALTH_CHECKS=True)
+    def test_broken_connection_is_closed(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'close') as close:
+            check_connections()
+            close.assert_not_called()
+            with mock.patch.object(
+                connection,
+                'is_usable',
+                return_value=False,
+            ):
+                check_connections()
+            close.assert_called_once()
+
+    def test_dbbench_reports_every_profile(self):
+        output = io.StringIO()
+        call_command(
+            'dbbench',
+            seconds=0.1,
+            readers=1,
+            writers=1,
+            rows=100,
+            stdout=output,
+        )
+        self.assertEqual(len(output.getvalue().splitlines()), 4)
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import StoredFile
+from posts.models import Comment, Group, Post
+from posts.tests.common import image
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            group=group,
+            text='Пост с картинкой',
+            image=image(),
+        )
+        Post.objects.create(author=cls.user, text='Второй пост')
+        Comment.objects.create(
+            author=cls.user,
+            post=cls.post,
+            text='Комментарий',
+        )
+        cls.url = reverse('posts:profile_export', args=(cls.user.username,))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def download(self, export_format):
+        response = self.client.get(self.url, {'format': export_format})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_export(self):
+        records = [
+            json.loads(line)
+            for line in self.download('ndjson').decode().splitlines()
+        ]
+        self.assertEqual(
+            [record['type'] for record in records],
+            ['post', 'post', 'comment'],
+        )
+        self.assertEqual(records[0]['id'], self.post.id)
+        self.assertEqual(records[0]['group'], 'group')
+        self.assertEqual(records[2]['post'], self.post.id)
+
+    def test_csv_export(self):
+        rows = list(
+            csv.DictReader(io.StringIO(self.download('csv').decode())),
+        )
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]['text'], 'Второй пост')
+
+    def test_zip_export_contains_images(self):
+        with zipfile.ZipFile(io.BytesIO(self.download('zip'))) as archive:
+            names = archive.namelist()
+            lines = archive.read('posts.ndjson').decode().splitlines()
+        self.assertIn(f'images/{self.post.image.name}', names)
+        self.assertEqual(len(lines), 3)
+
+    def test_export_is_private(self):
+        self.client.force_login(self.other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+        self.other.is_staff = True
+        self.other.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_command_writes_export(self):
+        path = os.path.join(TEMP_MEDIA_ROOT, 'export.ndjson')
+        call_command(
+            'export_posts',
+            self.user.username,
+            output=path,
+            format='ndjson',
+        )
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(len(file.readlines()), 3)
+
+    def test_command_writes_to_its_stdout(self):
+        stdout = io.StringIO()
+        call_command('export_posts', self.user.username, stdout=stdout)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 3)
+        with self.assertRaisesMessage(CommandError, '--output'):
+            call_command(
+                'export_posts',
+                self.user.username,
+                format='zip',
+                stdout=io.StringIO(),
+            )
+
+    def test_reimported_export_shares_image_reference(self):
+        path = os.path.join(TEMP_MEDIA_ROOT, 'reimport.ndjson')
+        call_command(
+            'export_posts',
+            self.user.username,
+            output=path,
+            format='ndjson',
+        )
+        call_command(
+            'import_data',
+            path,
+            source='reimport',
+            skip_rebuild=True,
+            stdout=io.StringIO(),
+        )
+        name = self.post.image.name
+        imported = Post.objects.exclude(pk=self.post.pk).get(image=name)
+        self.assertEqual(StoredFile.objects.get(name=name).references, 2)
+        default_storage.delete(imported.image.name)
+        self.assertTrue(default_storage.exists(name))
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts import feeds
+from posts.models import FeedItem, Follow, Post, UserStats
+
+User = get_user_model()
+
+
+class FollowFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.follower, cls.author = [
+            User.objects.create_user(username=name)
+            for name in ('follower', 'author')
+        ]
+        cls.auth_follower = Client()
+        cls.auth_follower.force_login(cls.follower)
+        cls.post = Post.objects.create(author=cls.author, text='Старый пост')
+
+    def test_follow_fills_feed_with_existing_posts(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        self.assertTrue(
+            FeedItem.objects.filter(
+                user=self.follower,
+                post=self.post,
+            ).exists(),
+        )
+
+    def test_new_post_fans_out_to_followers(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        post = Post.objects.create(author=self.author, text='Новый пост')
+        self.assertTrue(
+            FeedItem.objects.filter(user=self.follower, post=post).exists(),
+        )
+
+    def test_unfollow_clears_feed(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        Follow.objects.get(user=self.follower, author=self.author).delete()
+        self.assertFalse(FeedItem.objects.filter(user=self.follower).exists())
+
+    def test_cold_feed_falls_back_to_follow_join(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        UserStats.objects.update(feed_ready=False)
+        FeedItem.objects.all().delete()
+        self.assertEqual(list(feeds.follow_feed(self.follower)), [self.post])
+        response = self.auth_follower.get(reverse('posts:follow_index'))
+        self.assertIn(self.post, response.context['page_obj'])
+
+    def test_feed_without_backfill_is_not_cut_to_new_items(self):
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=self.follower, author=self.author)
+        UserStats.objects.update(feed_ready=False)
+        FeedItem.objects.all().delete()
+        Follow.objects.create(user=self.follower, author=other)
+        new = Post.objects.create(author=other, text='Новый пост')
+        self.assertEqual(
+            list(feeds.follow_feed(self.follower)),
+            [new, self.post],
+        )
+        call_command('backfill_feed', stdout=StringIO())
+        self.assertTrue(UserStats.objects.get(user=self.follower).feed_ready)
+        self.assertEqual(
+            list(feeds.follow_feed(self.follower)),
+            [new, self.post],
+        )
+
+    def test_backfill_command_warms_feed(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        FeedItem.objects.all().delete()
+        call_command('backfill_feed', stdout=StringIO())
+        self.assertEqual(
+            list(
+                FeedItem.objects.filter(user=self.follower).values_list(
+                    'post_id',
+                    flat=True,
+                ),
+            ),
+            [self.post.id],
+        )
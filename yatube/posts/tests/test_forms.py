@@ -1,15 +1,23 @@
 import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from mixer.backend.django import mixer
+from PIL import Image
 
+from posts.forms import PostForm
 from posts.models import Comment, Post
 from posts.tests.common import image
 
 User = get_user_model()
+ORIENTATION_TAG = 0x0112
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
 @override_settings(MEDIA_ROOT=settings.MEDIA_ROOT)
@@ -84,6 +92,28 @@ class PostFormTest(TestCase):
         self.assertEqual(post.group, None)
         self.assertEqual(post.author, self.user)
 
+    def test_edit_keeps_concurrent_comments_count(self):
+        post = Post.objects.create(author=self.user, text='Тестовый текст')
+        is_valid = PostForm.is_valid
+
+        def comment_meanwhile(form):
+            Post.objects.filter(pk=post.pk).update(comments_count=3)
+            return is_valid(form)
+
+        with mock.patch.object(
+            PostForm,
+            'is_valid',
+            autospec=True,
+            side_effect=comment_meanwhile,
+        ):
+            self.auth.post(
+                reverse('posts:post_edit', args=(post.id,)),
+                {'text': 'Изменяем пост'},
+            )
+        post.refresh_from_db()
+        self.assertEqual(post.text, 'Изменяем пост')
+        self.assertEqual(post.comments_count, 3)
+
     def test_auth_client_cant_edit_another_post(self):
         self.post = Post.objects.create(
             text='Тестовый текст',
@@ -164,4 +194,70 @@ class PostFormTest(TestCase):
         post = Post.objects.get()
         self.assertEqual(post.group, self.group)
         self.assertEqual(post.text, 'Тестовый пост')
-        self.assertEqual(post.image, 'posts/giffy.gif')
+        self.assertRegex(post.image.name, r'^posts/\w{2}/\w{64}\.gif$')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_MAX_SIZE=(200, 200))
+class ImageUploadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.auth = Client()
+        cls.auth.force_login(cls.user)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def photo(self, size, orientation=1):
+        file = BytesIO()
+        exif = Image.Exif()
+        exif[ORIENTATION_TAG] = orientation
+        Image.new('RGB', size, (10, 200, 30)).save(
+            file,
+            'jpeg',
+            exif=exif.tobytes(),
+        )
+        return SimpleUploadedFile(
+            'photo.jpg',
+            file.getvalue(),
+            content_type='image/jpeg',
+        )
+
+    def test_upload_is_oriented_downscaled_and_stripped(self):
+        self.auth.post(
+            reverse('posts:post_create'),
+            {'text': 'Фото', 'image': self.photo((600, 300), orientation=6)},
+        )
+        post = Post.objects.get()
+        self.assertRegex(post.image.name, r'^posts/\w{2}/\w{64}\.jpg$')
+        with Image.open(post.image.path) as stored:
+            self.assertEqual(stored.size, (100, 200))
+            self.assertNotIn(ORIENTATION_TAG, stored.getexif())
+
+    @override_settings(IMAGE_MAX_PIXELS=100)
+    def test_too_many_pixels_are_rejected(self):
+        response = self.auth.post(
+            reverse('posts:post_create'),
+            {'text': 'Фото', 'image': self.photo((20, 20))},
+        )
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(response.context['form'].has_error('image'))
+
+    def test_truncated_image_is_a_form_error(self):
+        data = self.photo((600, 300)).read()
+        response = self.auth.post(
+            reverse('posts:post_create'),
+            {
+                'text': 'Фото',
+                'image': SimpleUploadedFile(
+                    'photo.jpg',
+                    data[: len(data) // 2],
+                    content_type='image/jpeg',
+                ),
+            },
+        )
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(response.context['form'].has_error('image'))
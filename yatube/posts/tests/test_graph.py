@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from posts import graph
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.first, cls.second, cls.third = [
+            User.objects.create_user(username=name)
+            for name in ('first', 'second', 'third')
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def follow(self, user, author):
+        Follow.objects.create(user=user, author=author)
+
+    def test_index_follows_signals(self):
+        self.assertFalse(graph.follows(self.first.id, self.second.id))
+        self.follow(self.first, self.third)
+        self.follow(self.first, self.second)
+        self.assertEqual(
+            list(graph.following(self.first.id)),
+            sorted([self.second.id, self.third.id]),
+        )
+        self.assertTrue(graph.follows(self.first.id, self.second.id))
+        Follow.objects.get(user=self.first, author=self.second).delete()
+        self.assertFalse(graph.follows(self.first.id, self.second.id))
+        self.assertEqual(list(graph.followers(self.third.id)), [self.first.id])
+
+    def test_mutuals(self):
+        self.follow(self.first, self.second)
+        self.follow(self.second, self.first)
+        self.follow(self.first, self.third)
+        self.assertEqual(list(graph.mutuals(self.first.id)), [self.second.id])
+
+    def test_lookups_hit_cache(self):
+        self.follow(self.first, self.second)
+        graph.follows(self.first.id, self.second.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(graph.follows(self.first.id, self.second.id))
+
+    def test_rebuild_drops_stale_arrays(self):
+        self.follow(self.first, self.second)
+        self.assertTrue(graph.follows(self.first.id, self.second.id))
+        Follow.objects.all()._raw_delete(Follow.objects.db)
+        self.follow(self.second, self.third)
+        call_command('rebuild_follow_graph', stdout=StringIO())
+        with self.assertNumQueries(1):
+            self.assertFalse(graph.follows(self.first.id, self.second.id))
+        with self.assertNumQueries(0):
+            self.assertTrue(graph.follows(self.second.id, self.third.id))
+
+    def test_profile_shows_follow_state_of_current_user(self):
+        self.follow(self.third, self.second)
+        self.client.force_login(self.first)
+        url = reverse('posts:profile', args=(self.second.username,))
+        self.assertFalse(self.client.get(url).context['following'])
+        self.client.get(
+            reverse('posts:profile_follow', args=(self.second.username,)),
+        )
+        self.assertTrue(self.client.get(url).context['following'])
@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user, cls.other = [
+            User.objects.create_user(username=name)
+            for name in ('auth', 'other')
+        ]
+        cls.group, cls.empty = [
+            Group.objects.create(
+                title=title,
+                slug=slug,
+                description='Описание',
+            )
+            for title, slug in (('Группа', 'group'), ('Пустая', 'empty'))
+        ]
+        cls.anon = Client()
+        cls.url = reverse('posts:group_index')
+
+    def setUp(self):
+        cache.clear()
+
+    def stats(self, group):
+        return GroupStats.objects.get(group=group)
+
+    def post(self, author, group=None):
+        return Post.objects.create(
+            author=author,
+            group=group or self.group,
+            text='Пост',
+        )
+
+    def test_post_writes_update_activity(self):
+        self.post(self.user)
+        self.post(self.user)
+        last = self.post(self.other)
+        stats = self.stats(self.group)
+        self.assertEqual(stats.authors_count, 2)
+        self.assertEqual(stats.last_post_at, last.pub_date)
+
+        last.delete()
+        stats = self.stats(self.group)
+        self.assertEqual(stats.authors_count, 1)
+        self.assertLess(stats.last_post_at, last.pub_date)
+
+        moved = self.post(self.other)
+        moved.group = self.empty
+        moved.save()
+        self.assertEqual(self.stats(self.group).authors_count, 1)
+        self.assertEqual(self.stats(self.empty).authors_count, 1)
+        self.assertEqual(self.stats(self.empty).last_post_at, moved.pub_date)
+
+    def test_reconcile_restores_activity(self):
+        post = self.post(self.user)
+        GroupStats.objects.update(authors_count=0, last_post_at=None)
+        call_command('reconcile_stats', stdout=StringIO())
+        stats = self.stats(self.group)
+        self.assertEqual(stats.authors_count, 1)
+        self.assertEqual(stats.last_post_at, post.pub_date)
+
+    def test_directory_is_one_cached_page(self):
+        self.post(self.user)
+        response = self.anon.get(self.url)
+        self.assertEqual(
+            [stats.group for stats in response.context['groups']],
+            [self.group, self.empty],
+        )
+        with self.assertNumQueries(0):
+            self.anon.get(self.url)
+        self.post(self.other)
+        self.assertContains(self.anon.get(self.url), 'авторов: 2')
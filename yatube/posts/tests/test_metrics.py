@@ -0,0 +1,128 @@
+import threading
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+from posts.models import Post
+
+User = get_user_model()
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def test_request_is_recorded_per_view(self):
+        self.client.get(reverse('posts:index'))
+        total = metrics.collect()
+        labels = (('view', 'posts:index'),)
+        self.assertEqual(
+            total[
+                (
+                    'yatube_http_requests_total',
+                    labels + (('method', 'GET'), ('status', '200')),
+                )
+            ],
+            1,
+        )
+        queries = total[('yatube_db_queries_per_request', labels)]
+        self.assertEqual(queries[-2], 1)
+        self.assertGreater(queries[-3], 0)
+
+    def test_cache_hits_and_misses(self):
+        cache.get('missing')
+        cache.set('present', 1)
+        cache.get('present')
+        cache.get_many(['present', 'missing'])
+        total = metrics.collect()
+        self.assertEqual(
+            total[('yatube_cache_requests_total', (('result', 'hit'),))],
+            2,
+        )
+        self.assertEqual(
+            total[('yatube_cache_requests_total', (('result', 'miss'),))],
+            2,
+        )
+
+    def test_values_above_last_bucket_do_not_leak_into_sum(self):
+        for value in (500, 3):
+            metrics.observe(
+                'yatube_db_queries_per_request',
+                (('view', 'overflow'),),
+                value,
+                metrics.QUERY_BUCKETS,
+            )
+        content = metrics.render()
+        labels = 'view="overflow"'
+        self.assertIn(
+            f'yatube_db_queries_per_request_sum{{{labels}}} 503',
+            content,
+        )
+        self.assertIn(
+            f'yatube_db_queries_per_request_bucket{{{labels},le="200"}} 1',
+            content,
+        )
+        self.assertIn(
+            f'yatube_db_queries_per_request_bucket{{{labels},le="+Inf"}} 2',
+            content,
+        )
+
+    def test_counters_of_finished_threads_are_kept(self):
+        thread = threading.Thread(
+            target=metrics.inc,
+            args=('yatube_http_requests_total', (('view', 'thread'),)),
+        )
+        thread.start()
+        thread.join()
+        del thread
+        metrics.inc('yatube_http_requests_total', (('view', 'thread'),))
+        self.assertEqual(
+            metrics.collect()[
+                ('yatube_http_requests_total', (('view', 'thread'),))
+            ],
+            2,
+        )
+
+    def test_endpoint_renders_prometheus_text(self):
+        self.client.get(reverse('posts:index'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        content = response.content.decode()
+        self.assertIn(
+            'yatube_http_request_duration_seconds_bucket'
+            '{view="posts:index",le="+Inf"} 1',
+            content,
+        )
+        self.assertIn('# TYPE yatube_cache_requests_total counter', content)
+
+    def test_endpoint_is_closed_for_other_addresses(self):
+        response = self.client.get(
+            reverse('metrics'),
+            REMOTE_ADDR='10.0.0.1',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_replaces_address_check(self):
+        url = reverse('metrics')
+        self.assertEqual(
+            self.client.get(url).status_code,
+            HTTPStatus.FORBIDDEN,
+        )
+        response = self.client.get(
+            url,
+            REMOTE_ADDR='10.0.0.1',
+            HTTP_AUTHORIZATION='Bearer secret',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
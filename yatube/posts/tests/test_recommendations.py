@@ -0,0 +1,98 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts import recommendations
+from posts.models import Follow, Recommendation
+
+User = get_user_model()
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.friend, cls.twin, cls.star, cls.niche = [
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'twin', 'star', 'niche')
+        ]
+        for user, author in (
+            (cls.reader, cls.friend),
+            (cls.friend, cls.star),
+            (cls.twin, cls.friend),
+            (cls.twin, cls.niche),
+            (cls.twin, cls.star),
+        ):
+            Follow.objects.create(user=user, author=author)
+
+    def setUp(self):
+        cache.clear()
+
+    def suggest(self, user):
+        following, followers = recommendations.load_graph()
+        return recommendations.suggest(user.id, following, followers, 10)
+
+    def test_friends_of_friends_rank_first(self):
+        suggestions = self.suggest(self.reader)
+        self.assertEqual(
+            [author_id for author_id, _, _ in suggestions],
+            [self.star.id, self.niche.id],
+        )
+        self.assertEqual(suggestions[0][2], 1)
+        self.assertEqual(suggestions[1][2], 0)
+
+    def test_followed_authors_and_self_are_excluded(self):
+        author_ids = [author_id for author_id, _, _ in self.suggest(self.twin)]
+        self.assertNotIn(self.twin.id, author_ids)
+        self.assertNotIn(self.friend.id, author_ids)
+
+    @override_settings(RECOMMENDATION_MAX_FANOUT=1)
+    def test_popular_authors_do_not_make_readers_similar(self):
+        author_ids = [
+            author_id for author_id, _, _ in self.suggest(self.reader)
+        ]
+        self.assertNotIn(self.niche.id, author_ids)
+
+    def test_pages_serve_precomputed_table(self):
+        call_command('build_recommendations', stdout=StringIO())
+        self.assertEqual(
+            Recommendation.objects.filter(user=self.reader).count(),
+            2,
+        )
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [r.author for r in response.context['recommendations']],
+            [self.star, self.niche],
+        )
+        response = self.client.get(
+            reverse('posts:profile', args=(self.reader.username,)),
+        )
+        self.assertContains(response, 'Кого почитать')
+
+        Follow.objects.create(user=self.reader, author=self.star)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [r.author for r in response.context['recommendations']],
+            [self.niche],
+        )
+
+    def test_rebuild_refreshes_cached_profile(self):
+        self.client.force_login(self.reader)
+        url = reverse('posts:profile', args=(self.reader.username,))
+        self.assertNotContains(self.client.get(url), 'Кого почитать')
+        call_command('build_recommendations', stdout=StringIO())
+        self.assertContains(self.client.get(url), 'Кого почитать')
+
+    def test_follow_refreshes_follower_profile(self):
+        call_command('build_recommendations', stdout=StringIO())
+        self.client.force_login(self.reader)
+        url = reverse('posts:profile', args=(self.reader.username,))
+        self.assertContains(self.client.get(url), self.star.username)
+        Follow.objects.create(user=self.reader, author=self.star)
+        Follow.objects.create(user=self.reader, author=self.niche)
+        self.assertNotContains(self.client.get(url), 'Кого почитать')
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, router
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.db import replica_reads
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """Вторая база SQLite играет роль реплики, которая ещё не догнала."""
+
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        connections.databases['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+        }
+        connections.ensure_defaults('replica')
+        connections.prepare_test_settings('replica')
+        super().setUpClass()
+        call_command('migrate', database='replica', verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections.databases['replica']
+        delattr(connections._connections, 'replica')
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='auth')
+        self.post = Post.objects.create(author=self.user, text='Пост')
+        self.url = reverse('posts:post_detail', args=(self.post.id,))
+
+    def test_router(self):
+        self.assertEqual(router.db_for_read(Post), 'default')
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            self.assertEqual(router.db_for_write(Post), 'default')
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=0)
+    def test_read_only_views_read_from_replica(self):
+        self.assertEqual(Client().get(self.url).status_code, 404)
+
+    def test_freshly_changed_page_is_rendered_from_primary(self):
+        response = Client().get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Пост')
+
+    def test_client_is_pinned_to_primary_after_write(self):
+        client = Client()
+        client.force_login(self.user)
+        response = client.post(
+            reverse('posts:add_comment', args=(self.post.id,)),
+            {'text': 'Комментарий'},
+        )
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Комментарий')
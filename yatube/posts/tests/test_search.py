@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Post
+from posts.search import SearchResults
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.anon = Client()
+        cls.cat_post = Post.objects.create(
+            author=cls.user,
+            text='Кот спит на диване',
+        )
+        cls.dog_post = Post.objects.create(
+            author=cls.user,
+            text='Собака гуляет во дворе',
+        )
+        Comment.objects.create(
+            post=cls.dog_post,
+            author=cls.user,
+            text='А кот смотрит на собаку из окна',
+        )
+
+    def search(self, query):
+        return SearchResults(query)[0:10]
+
+    def test_finds_posts_by_post_and_comment_text(self):
+        self.assertEqual(self.search('диван'), [self.cat_post])
+        self.assertEqual(
+            set(self.search('кот')),
+            {self.cat_post, self.dog_post},
+        )
+        self.assertEqual(SearchResults('кот').count(), 2)
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.get(id=self.cat_post.id)
+        post.text = 'Кошка спит на кресле'
+        post.save()
+        self.assertEqual(self.search('диван'), [])
+        self.assertEqual(self.search('кресле'), [post])
+        Comment.objects.all().delete()
+        self.assertEqual(self.search('окна'), [])
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM posts_search')
+        self.assertEqual(self.search('диван'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('диван'), [self.cat_post])
+
+    def test_search_view_paginates_results(self):
+        response = self.anon.get(reverse('posts:search'), {'q': 'собака'})
+        self.assertEqual(list(response.context['page_obj']), [self.dog_post])
+        self.assertContains(response, 'Собака гуляет во дворе')
+
+    def test_empty_query_has_no_results(self):
+        response = self.anon.get(reverse('posts:search'), {'q': '!!!'})
+        self.assertEqual(len(response.context['page_obj']), 0)
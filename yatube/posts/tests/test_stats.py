@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import Comment, Follow, GroupStats, Post, UserStats
+
+User = get_user_model()
+
+
+class StatsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user, cls.reader = [
+            User.objects.create_user(username=name)
+            for name in ('auth', 'reader')
+        ]
+        cls.anon = Client()
+        cls.group = mixer.blend('posts.Group')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def test_writes_update_stats(self):
+        Comment.objects.create(post=self.post, author=self.reader, text='!')
+        Follow.objects.create(user=self.reader, author=self.user)
+        self.assertEqual(self.stats(self.user).posts_count, 1)
+        self.assertEqual(self.stats(self.user).followers_count, 1)
+        self.assertEqual(self.stats(self.reader).following_count, 1)
+        self.assertEqual(self.stats(self.reader).comments_count, 1)
+        group_stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(group_stats.posts_count, 1)
+        self.assertEqual(group_stats.comments_count, 1)
+        Post.objects.get(id=self.post.id).delete()
+        self.assertEqual(self.stats(self.user).posts_count, 0)
+        self.assertEqual(self.stats(self.reader).comments_count, 0)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).posts_count,
+            0,
+        )
+
+    def test_reconcile_command_fixes_drift(self):
+        UserStats.objects.filter(user=self.user).update(posts_count=7)
+        UserStats.objects.filter(user=self.reader).delete()
+        call_command('reconcile_stats', stdout=StringIO())
+        self.assertEqual(self.stats(self.user).posts_count, 1)
+        self.assertEqual(self.stats(self.reader).posts_count, 0)
+
+    def test_pages_render_without_aggregates(self):
+        # Странице поста нужен ещё запрос автора для ETag.
+        urls = (
+            (reverse('posts:profile', args=(self.user.username,)), 2),
+            (reverse('posts:post_detail', args=(self.post.id,)), 3),
+        )
+        for url, queries in urls:
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    response = self.anon.get(url)
+                self.assertContains(response, 'Всего постов')
+
+    def test_comment_writes_update_post_counter(self):
+        comment = Comment.objects.create(
+            post=self.post,
+            author=self.reader,
+            text='!',
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_backfill_command_fixes_comment_counts(self):
+        Comment.objects.create(post=self.post, author=self.reader, text='!')
+        Post.objects.update(comments_count=5)
+        call_command('backfill_comment_counts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_feed_cards_show_comment_counts_without_queries(self):
+        for number in range(5):
+            post = Post.objects.create(
+                author=self.user,
+                text=f'Пост {number}',
+                group=self.group,
+            )
+            Comment.objects.create(post=post, author=self.reader, text='!')
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        # Группа, её статистика и одна страница постов.
+        with self.assertNumQueries(3):
+            response = self.anon.get(url)
+        self.assertContains(response, 'Комментариев: 1', count=5)
+        self.assertContains(response, 'Комментариев: 0', count=1)
@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from sorl.thumbnail import default as sorl_default
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.images import ImageFile
+
+from core.models import StoredFile
+from posts.models import Post
+from posts.tests.common import image
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class HashedStorageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def references(self, name):
+        return StoredFile.objects.get(name=name).references
+
+    def test_identical_uploads_are_stored_once(self):
+        first = default_storage.save('posts/first.gif', image('first.gif'))
+        second = default_storage.save('posts/second.gif', image('second.gif'))
+        self.assertEqual(first, second)
+        self.assertEqual(self.references(first), 2)
+
+        default_storage.delete(first)
+        self.assertTrue(default_storage.exists(first))
+        self.assertEqual(self.references(first), 1)
+
+        default_storage.delete(first)
+        self.assertFalse(default_storage.exists(first))
+        self.assertFalse(StoredFile.objects.filter(name=first).exists())
+
+    def test_hashed_file_without_references_is_kept(self):
+        name = default_storage.save('posts/photo.gif', image())
+        StoredFile.objects.filter(name=name).delete()
+        default_storage.delete(name)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_deleting_post_releases_its_image(self):
+        with mock.patch(
+            'posts.signals.transaction.on_commit',
+            side_effect=lambda func: func(),
+        ):
+            posts = [
+                Post.objects.create(
+                    author=self.user,
+                    text='Мем',
+                    image=image(),
+                )
+                for _ in range(2)
+            ]
+            name = posts[0].image.name
+            self.assertEqual(posts[1].image.name, name)
+            posts[0].delete()
+            self.assertTrue(default_storage.exists(name))
+            posts[1].delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_reuploading_same_image_keeps_one_reference(self):
+        with mock.patch(
+            'posts.signals.transaction.on_commit',
+            side_effect=lambda func: func(),
+        ):
+            post = Post.objects.create(
+                author=self.user,
+                text='Мем',
+                image=image(),
+            )
+            name = post.image.name
+            post = Post.objects.get(pk=post.pk)
+            post.image = image('again.gif')
+            post.save()
+            self.assertEqual(post.image.name, name)
+            self.assertEqual(self.references(name), 1)
+            post.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_last_reference_removes_thumbnails(self):
+        name = default_storage.save('posts/photo.gif', image())
+        thumbnail = get_thumbnail(ImageFile(name, default_storage), '10x10')
+        self.assertTrue(thumbnail.exists())
+        default_storage.delete(name)
+        self.assertFalse(thumbnail.exists())
+        self.assertIsNone(sorl_default.kvstore.get(thumbnail))
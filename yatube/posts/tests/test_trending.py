@@ -0,0 +1,120 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Comment, Follow, Group, Post, TrendingPost
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.quiet, cls.busy = [
+            Group.objects.create(
+                title=slug,
+                slug=slug,
+                description='Описание',
+            )
+            for slug in ('quiet', 'busy')
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def score(self, post):
+        return TrendingPost.objects.get(post=post).score
+
+    def test_log_space_sum(self):
+        self.assertAlmostEqual(trending.log_sum([3, 3, 4]), 5)
+        post = Post.objects.create(author=self.user, text='Пост')
+        TrendingPost.objects.filter(post=post).delete()
+        trending._add(TrendingPost, post.pk, 3)
+        self.assertEqual(self.score(post), 3)
+        trending._add(TrendingPost, post.pk, 3)
+        self.assertAlmostEqual(self.score(post), 4)
+        trending._add(TrendingPost, post.pk, 1000)
+        trending._add(TrendingPost, post.pk, 0)
+        self.assertAlmostEqual(self.score(post), 1000)
+
+    def test_older_events_weigh_less(self):
+        now = timezone.now()
+        self.assertAlmostEqual(
+            trending.points(1, now)
+            - trending.points(1, now - settings.TRENDING_HALF_LIFE),
+            1,
+        )
+
+    def test_comments_and_follows_raise_post(self):
+        old = Post.objects.create(
+            author=self.user,
+            group=self.busy,
+            text='Старый',
+        )
+        new = Post.objects.create(
+            author=self.reader,
+            group=self.quiet,
+            text='Новый',
+        )
+        self.assertGreaterEqual(self.score(new), self.score(old))
+        Comment.objects.create(author=self.reader, post=old, text='Ого')
+        self.assertGreater(self.score(old), self.score(new))
+        before = self.score(old)
+        Follow.objects.create(user=self.reader, author=self.user)
+        self.assertGreater(self.score(old), before)
+        self.assertEqual(list(trending.top_posts()), [old, new])
+        self.assertEqual(list(trending.top_groups()), [self.busy, self.quiet])
+
+    def test_repeated_events_add_in_log_space(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        TrendingPost.objects.filter(post=post).delete()
+        for _ in range(4):
+            trending._add(TrendingPost, post.pk, 3)
+        self.assertAlmostEqual(self.score(post), 5)
+
+    def test_follow_skips_posts_outside_window(self):
+        stale = Post.objects.create(author=self.user, text='Старый')
+        Post.objects.filter(pk=stale.pk).update(
+            pub_date=timezone.now()
+            - settings.TRENDING_WINDOW
+            - timedelta(days=1),
+        )
+        before = self.score(stale)
+        Follow.objects.create(user=self.reader, author=self.user)
+        self.assertEqual(self.score(stale), before)
+
+    def test_rebuild_drops_posts_outside_window(self):
+        fresh = Post.objects.create(author=self.user, text='Свежий')
+        stale = Post.objects.create(author=self.user, text='Старый')
+        Post.objects.filter(pk=stale.pk).update(
+            pub_date=timezone.now()
+            - settings.TRENDING_WINDOW
+            - timedelta(days=1),
+        )
+        Comment.objects.create(author=self.reader, post=fresh, text='Ого')
+        expected = self.score(fresh)
+        TrendingPost.objects.all().delete()
+        call_command('rebuild_trending', stdout=StringIO())
+        self.assertAlmostEqual(self.score(fresh), expected, places=3)
+        self.assertFalse(TrendingPost.objects.filter(post=stale).exists())
+
+    def test_trending_page(self):
+        post = Post.objects.create(
+            author=self.user,
+            group=self.busy,
+            text='Пост',
+        )
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(list(response.context['page_obj']), [post])
+        self.assertEqual(list(response.context['groups']), [self.busy])
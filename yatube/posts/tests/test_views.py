@@ -4,13 +4,22 @@ from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.test import Client, TestCase, override_settings
+from django.db import transaction
+from django.test import (
+    Client,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
 from django.urls import reverse
 from mixer.backend.django import mixer
 
-from posts.models import Follow, Post
+from core.cache import bump, get_version
+from posts import pages
+from posts.models import Comment, Follow, Group, Post
 from posts.tests import consts
 from posts.tests.common import image
+from posts.thumbnails import cached_rendition, generate_renditions
 
 User = get_user_model()
 
@@ -322,11 +331,197 @@ class PostUploadImageTests(TestCase):
         )
         self.assertEqual(response.context['post'].image, self.post.image)
 
+    def test_image_rendition_replaces_original_once_generated(self):
+        url = reverse('posts:index')
+        self.assertContains(self.anon.get(url), self.post.image.url)
+        generate_renditions(self.post.id)
+        rendition = cached_rendition(self.post.image, 'card')
+        self.assertIsNotNone(rendition)
+        response = self.anon.get(url)
+        self.assertContains(response, rendition.url)
+        self.assertNotContains(response, self.post.image.url)
+
     def test_check_cache(self):
         response = self.anon.get(reverse('posts:index'))
-        Post.objects.get(id=1).delete()
-        response2 = self.anon.get(reverse('posts:index'))
+        with self.assertNumQueries(0):
+            response2 = self.anon.get(reverse('posts:index'))
         self.assertEqual(response.content, response2.content)
-        cache.clear()
+        Post.objects.get(id=self.post.id).delete()
         response3 = self.anon.get(reverse('posts:index'))
         self.assertNotEqual(response.content, response3.content)
+
+    def test_cache_invalidated_by_post_writes(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        before = [self.anon.get(url).content for url in urls]
+        Post.objects.create(
+            author=self.user,
+            text='Свежий пост',
+            group=self.group,
+        )
+        for url, content in zip(urls, before):
+            with self.subTest(url=url):
+                response = self.anon.get(url)
+                self.assertNotEqual(response.content, content)
+                self.assertContains(response, 'Свежий пост')
+
+    def test_cache_invalidated_by_group_edit(self):
+        group = Group.objects.create(
+            title='Группа',
+            slug='old-slug',
+            description='Старое описание',
+        )
+        old_url = reverse('posts:group_list', args=(group.slug,))
+        self.assertContains(self.anon.get(old_url), 'Старое описание')
+        group.description = 'Новое описание'
+        group.save()
+        self.assertContains(self.anon.get(old_url), 'Новое описание')
+        group.slug = 'new-slug'
+        group.save()
+        self.assertEqual(self.anon.get(old_url).status_code, 404)
+        new_url = reverse('posts:group_list', args=(group.slug,))
+        self.assertContains(self.anon.get(new_url), 'Новое описание')
+        group.delete()
+        self.assertEqual(self.anon.get(new_url).status_code, 404)
+
+
+@override_settings(
+    CURSOR_PAGINATED_VIEWS=('posts:index', 'posts:group_list'),
+)
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.anon = Client()
+        cls.group = mixer.blend('posts.Group')
+        for post_number in range(consts.POSTS_AMOUNT):
+            Post.objects.create(
+                author=cls.user,
+                text='Тестовый пост' + str(post_number),
+                group=cls.group,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_pages_walk_forward_and_back(self):
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        first = self.anon.get(url).context['page_obj']
+        self.assertEqual(len(first), settings.PAGE_SIZE)
+        self.assertFalse(first.has_previous())
+        second = self.anon.get(
+            url,
+            {'cursor': first.next_cursor},
+        ).context['page_obj']
+        self.assertEqual(len(second), consts.PAGINATOR_SECOND_PAGE)
+        self.assertFalse(second.has_next())
+        self.assertEqual(
+            list(first) + list(second),
+            list(Post.objects.order_by('-pub_date', '-id')),
+        )
+        back = self.anon.get(
+            url,
+            {'cursor': second.previous_cursor},
+        ).context['page_obj']
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        response = self.anon.get(reverse('posts:index'), {'cursor': 'broken'})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            list(
+                Post.objects.order_by('-pub_date', '-id')[:settings.PAGE_SIZE],
+            ),
+        )
+
+    def test_cursor_page_skips_count_query(self):
+        with self.assertNumQueries(1):
+            self.anon.get(reverse('posts:index'))
+
+
+class PostDetailCommentsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.anon = Client()
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.comments_amount = settings.COMMENTS_PAGE_SIZE + 5
+        for commentator in mixer.cycle(cls.comments_amount).blend(User):
+            Comment.objects.create(
+                post=cls.post,
+                author=commentator,
+                text=f'Комментарий {commentator.username}',
+            )
+
+    def test_post_detail_queries_do_not_grow_with_comments(self):
+        url = reverse('posts:post_detail', args=(self.post.id,))
+        # ETag, пост с автором, первая страница комментариев.
+        with self.assertNumQueries(3):
+            response = self.anon.get(url)
+        comments = response.context['comments']
+        self.assertEqual(len(comments), settings.COMMENTS_PAGE_SIZE)
+        self.assertTrue(comments.has_next())
+        more = self.anon.get(url, {'comments': comments.next_cursor})
+        self.assertEqual(
+            len(more.context['comments']),
+            self.comments_amount - settings.COMMENTS_PAGE_SIZE,
+        )
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:profile', args=(cls.user.username,)),
+            reverse('posts:post_detail', args=(cls.post.id,)),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_pages_answer_not_modified(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_content(self):
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+        Comment.objects.create(
+            author=self.reader,
+            post=self.post,
+            text='Новый комментарий',
+        )
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        url = self.urls[1]
+        anonymous = self.client.get(url)['ETag']
+        self.client.force_login(self.reader)
+        self.assertNotEqual(self.client.get(url)['ETag'], anonymous)
+
+
+class PageVersionTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_inside_transaction_repeats_after_commit(self):
+        with transaction.atomic():
+            bump(pages.INDEX_PAGE)
+            inside = get_version(pages.INDEX_PAGE)
+        self.assertGreater(get_version(pages.INDEX_PAGE), inside)
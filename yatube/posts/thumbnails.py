@@ -0,0 +1,88 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, connections
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import ImageFile
+
+from posts import cards, pages
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+class RenditionBackend(ThumbnailBackend):
+    def get_cached(self, file_, geometry_string, **options):
+        """Возвращает готовую миниатюру или None, ничего не генерируя."""
+        source = ImageFile(file_)
+        if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(sorl_settings, attr)
+            if value != getattr(sorl_defaults, attr):
+                options.setdefault(key, value)
+        return default.kvstore.get(
+            ImageFile(
+                self._get_thumbnail_filename(source, geometry_string, options),
+                default.storage,
+            ),
+        )
+
+
+backend = RenditionBackend()
+
+
+def cached_rendition(image, name):
+    if not image:
+        return None
+    geometry, options = settings.THUMBNAIL_RENDITIONS[name]
+    return backend.get_cached(image, geometry, **options)
+
+
+def generate_renditions(post_id):
+    try:
+        post = Post.objects.select_related('author').get(id=post_id)
+        if not post.image:
+            return
+        for geometry, options in settings.THUMBNAIL_RENDITIONS.values():
+            get_thumbnail(post.image, geometry, **options)
+        cards.forget_card(post)
+        pages.bump_post_pages(post)
+    except Exception:
+        logger.exception('Не удалось создать миниатюры поста %s', post_id)
+
+
+def _generate_in_worker(post_id):
+    try:
+        generate_renditions(post_id)
+    finally:
+        # Соединения потока пула закрываем сами: Django о них не знает.
+        connections.close_all()
+
+
+def _run_inline():
+    # Базу SQLite в памяти нельзя безопасно делить между потоками.
+    return not settings.THUMBNAIL_WORKERS or (
+        connection.vendor == 'sqlite' and connection.is_in_memory_db()
+    )
+
+
+def schedule_renditions(post_id):
+    global _executor
+    if _run_inline():
+        generate_renditions(post_id)
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            thread_name_prefix='thumbnails',
+        )
+    _executor.submit(_generate_in_worker, post_id)
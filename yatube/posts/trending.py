@@ -0,0 +1,150 @@
+"""Рейтинг «в тренде» с экспоненциальным затуханием.
+
+Событие весом w в момент t к моменту now весит w·2^(-(now - t)/T),
+где T — TRENDING_HALF_LIFE. Затухание общее для всех строк, поэтому
+хранится не текущий вес, а log2(Σ w·2^((t - EPOCH)/T)): порядок строк
+от времени не зависит, новое событие складывается с рейтингом
+в лог-пространстве, и переписывать таблицу по таймеру не нужно.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest, Least, Ln, Power
+from django.utils import timezone
+
+from posts.models import Comment, Group, Post, TrendingGroup, TrendingPost
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def points(weight, moment):
+    half_lives = (moment - EPOCH).total_seconds() / (
+        settings.TRENDING_HALF_LIFE.total_seconds()
+    )
+    return math.log2(weight) + half_lives
+
+
+def log_sum(values):
+    high = max(values)
+    return high + math.log2(sum(2 ** (value - high) for value in values))
+
+
+def _log_add_expression(field, score):
+    """log2(2^field + 2^score) одним выражением SQL без переполнения."""
+    score = Value(score, output_field=FloatField())
+    high, low = Greatest(field, score), Least(field, score)
+    return high + Ln(1 + Power(2, low - high)) / math.log(2)
+
+
+def _add(model, pk, score):
+    """Складывает рейтинг одним UPDATE, не блокируя строку до конца записи."""
+    rows = model.objects.filter(pk=pk)
+    if rows.update(score=_log_add_expression(F('score'), score)):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(pk=pk, score=score)
+    except IntegrityError:
+        rows.update(score=_log_add_expression(F('score'), score))
+
+
+def add_event(post_id, group_id, event, moment=None):
+    score = points(
+        settings.TRENDING_WEIGHTS[event],
+        moment or timezone.now(),
+    )
+    _add(TrendingPost, post_id, score)
+    if group_id is not None:
+        _add(TrendingGroup, group_id, score)
+
+
+def post_added(post):
+    add_event(post.id, post.group_id, 'post', post.pub_date)
+
+
+def comment_added(comment):
+    add_event(comment.post_id, comment.post.group_id, 'comment')
+
+
+def follow_added(follow):
+    """Подписку засчитываем последнему посту автора: он её и принёс.
+
+    Посты старше TRENDING_WINDOW в рейтинг не попадают.
+    """
+    since = timezone.now() - settings.TRENDING_WINDOW
+    post = (
+        Post.objects.filter(author_id=follow.author_id, pub_date__gte=since)
+        .order_by('-pub_date', '-pk')
+        .values_list('id', 'group_id')
+        .first()
+    )
+    if post is not None:
+        add_event(*post, 'follow')
+
+
+def top_posts():
+    return (
+        Post.objects.filter(trending__isnull=False)
+        .select_related('author', 'group')
+        .order_by('-trending__score')[: settings.TRENDING_POSTS]
+    )
+
+
+def top_groups():
+    return Group.objects.filter(trending__isnull=False).order_by(
+        '-trending__score',
+    )[: settings.TRENDING_GROUPS]
+
+
+def rebuild():
+    """Пересчитывает рейтинг по постам и комментариям за TRENDING_WINDOW.
+
+    В Follow нет времени подписки, поэтому подписки учитываются
+    только сигналами. Строки старше окна удаляются.
+    """
+    since = timezone.now() - settings.TRENDING_WINDOW
+    post_points = defaultdict(list)
+    group_points = defaultdict(list)
+    events = (
+        (
+            'post',
+            Post.objects.filter(pub_date__gte=since).values_list(
+                'id',
+                'group_id',
+                'pub_date',
+            ),
+        ),
+        (
+            'comment',
+            Comment.objects.filter(pub_date__gte=since).values_list(
+                'post_id',
+                'post__group_id',
+                'pub_date',
+            ),
+        ),
+    )
+    for event, rows in events:
+        weight = settings.TRENDING_WEIGHTS[event]
+        for post_id, group_id, moment in rows.iterator():
+            score = points(weight, moment)
+            post_points[post_id].append(score)
+            if group_id is not None:
+                group_points[group_id].append(score)
+    with transaction.atomic():
+        for model, field, scores in (
+            (TrendingPost, 'post_id', post_points),
+            (TrendingGroup, 'group_id', group_points),
+        ):
+            model.objects.all().delete()
+            model.objects.bulk_create(
+                (
+                    model(**{field: pk, 'score': log_sum(values)})
+                    for pk, values in scores.items()
+                ),
+                batch_size=settings.STATS_BATCH_SIZE,
+            )
+    return len(post_points), len(group_points)
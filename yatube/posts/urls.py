@@ -8,6 +8,7 @@ app_name = PostsConfig.name
 urlpatterns = [
     path('create/', views.post_create, name='post_create'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path(
@@ -15,11 +16,18 @@ urlpatterns = [
     ),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('search/', views.search_posts, name='search'),
+    path('trending/', views.trending_posts, name='trending'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
         name='profile_follow',
     ),
+    path(
+        'profile/<str:username>/export/',
+        views.profile_export,
+        name='profile_export',
+    ),
     path(
         'profile/<str:username>/unfollow/',
         views.profile_unfollow,
@@ -1,17 +1,35 @@
+from functools import partial
+from urllib.parse import urlencode
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.cache import cache_page
 
-from core.utils import paginate
+from core.cache import versioned_cache_page, versioned_etag
+from core.utils import CursorPaginator, paginate
+from posts import (
+    counters,
+    export,
+    feeds,
+    graph,
+    pages,
+    recommendations,
+    search,
+    stats,
+    trending,
+)
 from posts.forms import CommentForm, PostForm
 from posts.models import Follow, Group, Post
 
 User = get_user_model()
 
 
-@cache_page(20, key_prefix='index_page')
+@versioned_etag(pages.INDEX_PAGE)
+@versioned_cache_page(settings.PAGE_CACHE_TIMEOUT, pages.INDEX_PAGE)
 def index(request):
     return render(
         request,
@@ -19,13 +37,42 @@ def index(request):
         {
             'page_obj': paginate(
                 request,
-                Post.objects.select_related('group', 'author'),
+                feeds.index_feed(),
                 settings.PAGE_SIZE,
+                counters.post_count,
             ),
         },
     )
 
 
+@cache_page(settings.TRENDING_CACHE_TIMEOUT)
+def trending_posts(request):
+    return render(
+        request,
+        'posts/trending.html',
+        {
+            'page_obj': paginate(
+                request,
+                trending.top_posts(),
+                settings.PAGE_SIZE,
+            ),
+            'groups': trending.top_groups(),
+        },
+    )
+
+
+@versioned_etag(pages.GROUPS_PAGE)
+@versioned_cache_page(settings.PAGE_CACHE_TIMEOUT, pages.GROUPS_PAGE)
+def group_index(request):
+    return render(
+        request,
+        'posts/group_index.html',
+        {'groups': stats.group_directory()},
+    )
+
+
+@versioned_etag(pages.group_page)
+@versioned_cache_page(settings.PAGE_CACHE_TIMEOUT, pages.group_page)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
     return render(
@@ -35,15 +82,21 @@ def group_posts(request, slug):
             'group': group,
             'page_obj': paginate(
                 request,
-                group.posts.select_related('group', 'author'),
+                feeds.group_feed(group),
                 settings.PAGE_SIZE,
+                partial(counters.post_count, group_id=group.id),
             ),
         },
     )
 
 
+@versioned_etag(pages.profile_page)
+@versioned_cache_page(settings.PAGE_CACHE_TIMEOUT, pages.profile_page)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_object_or_404(
+        User.objects.select_related('stats'),
+        username=username,
+    )
     return render(
         request,
         'posts/profile.html',
@@ -51,27 +104,58 @@ def profile(request, username):
             'author': author,
             'page_obj': paginate(
                 request,
-                author.posts.select_related('author', 'group'),
+                feeds.profile_feed(author),
                 settings.PAGE_SIZE,
+                stats.user_stats(author).posts_count,
             ),
             'following': request.user.is_authenticated
-            and author.following.exists(),
+            and graph.follows(request.user.id, author.id),
+            'recommendations': recommendations.for_user(request.user)
+            if author == request.user
+            else [],
         },
     )
 
 
+@versioned_etag(pages.post_page)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'),
+        id=post_id,
+    )
     return render(
         request,
         'posts/post_detail.html',
         {
             'post': post,
+            'author_stats': stats.user_stats(post.author),
+            'comments': CursorPaginator(
+                feeds.post_comments(post),
+                settings.COMMENTS_PAGE_SIZE,
+                cursor_param='comments',
+            ).get_page(request.GET.get('comments')),
             'form': CommentForm(),
         },
     )
 
 
+def search_posts(request):
+    query = request.GET.get('q', '').strip()
+    return render(
+        request,
+        'posts/search.html',
+        {
+            'query': query,
+            'page_params': urlencode({'q': query}) + '&',
+            'page_obj': paginate(
+                request,
+                search.search_posts(query),
+                settings.PAGE_SIZE,
+            ),
+        },
+    )
+
+
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
@@ -97,7 +181,10 @@ def post_edit(request, post_id):
         instance=post,
     )
     if form.is_valid():
-        form.save()
+        # comments_count меняют сигналы комментариев, форма его не трогает.
+        form.save(commit=False).save(
+            update_fields=(*form._meta.fields, 'updated'),
+        )
         return redirect('posts:post_detail', post_id=post.id)
     return render(
         request,
@@ -130,9 +217,10 @@ def follow_index(request):
         {
             'page_obj': paginate(
                 request,
-                Post.objects.filter(author__following__user=request.user),
+                feeds.follow_feed(request.user),
                 settings.PAGE_SIZE,
             ),
+            'recommendations': recommendations.for_user(request.user),
         },
     )
 
@@ -150,3 +238,20 @@ def profile_unfollow(request, username):
     author = User.objects.get(username=username)
     get_object_or_404(Follow, user_id=request.user, author=author).delete()
     return redirect('posts:profile', request.user)
+
+
+@login_required
+def profile_export(request, username):
+    author = get_object_or_404(User, username=username)
+    if request.user != author and not request.user.is_staff:
+        raise PermissionDenied
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in export.FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(
+        export.stream(author, export_format),
+        content_type=export.FORMATS[export_format],
+    )
+    filename = f'{author.username}.{export_format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -21,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'core.apps.CoreConfig',
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
@@ -28,11 +30,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -60,13 +64,95 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    },
+DB_ENGINE = os.getenv('YATUBE_DB_ENGINE', 'sqlite3')
+
+# Постоянные соединения: 0 — закрывать после каждого запроса.
+DB_CONN_MAX_AGE = int(os.getenv('YATUBE_DB_CONN_MAX_AGE', 60))
+
+# Проверять перед запросом, что постоянное соединение ещё живо.
+DB_HEALTH_CHECKS = os.getenv('YATUBE_DB_HEALTH_CHECKS', '1') == '1'
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('YATUBE_DB_NAME', 'yatube'),
+            'USER': os.getenv('YATUBE_DB_USER', 'yatube'),
+            'PASSWORD': os.getenv('YATUBE_DB_PASSWORD', ''),
+            'HOST': os.getenv('YATUBE_DB_HOST', 'localhost'),
+            'PORT': os.getenv('YATUBE_DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                'connect_timeout': int(
+                    os.getenv('YATUBE_DB_CONNECT_TIMEOUT', 5),
+                ),
+                'keepalives': 1,
+                'keepalives_idle': 30,
+                'options': '-c statement_timeout={}'.format(
+                    os.getenv('YATUBE_DB_STATEMENT_TIMEOUT', 30000),
+                ),
+            },
+        },
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv(
+                'YATUBE_DB_NAME',
+                os.path.join(BASE_DIR, 'db.sqlite3'),
+            ),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        },
+    }
+
+# Применяются к каждому новому соединению SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('YATUBE_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('YATUBE_SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.getenv('YATUBE_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv('YATUBE_SQLITE_CACHE_SIZE', -20000)),
+    'busy_timeout': int(os.getenv('YATUBE_SQLITE_BUSY_TIMEOUT', 5000)),
 }
 
+# Реплики только для чтения, через запятую: пути к файлам SQLite
+# или хосты PostgreSQL.
+DATABASE_REPLICAS = []
+
+for number, location in enumerate(
+    filter(None, os.getenv('YATUBE_DB_REPLICAS', '').split(',')),
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        ('HOST' if DB_ENGINE == 'postgresql' else 'NAME'): location,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+
+REPLICA_VIEWS = (
+    'posts:index',
+    'posts:group_index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:trending',
+    'api:index',
+    'api:group_list',
+    'api:profile',
+    'api:post_detail',
+)
+
+REPLICA_PIN_COOKIE = 'use_primary'
+
+REPLICA_PIN_SECONDS = 5
+
+# Сколько реплика может отставать: страницы, изменённые позже, рендерятся
+# с основной базы.
+REPLICA_MAX_LAG_SECONDS = REPLICA_PIN_SECONDS
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -82,9 +168,23 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# locmem — свой кеш в каждом процессе; memcached и database — общий
+# для всех процессов (для database нужен manage.py createcachetable).
+CACHE_BACKEND = os.getenv('YATUBE_CACHE_BACKEND', 'locmem')
+
+CACHE_BACKENDS = {
+    'locmem': ('core.metrics.MetricsLocMemCache', ''),
+    'memcached': ('core.metrics.MetricsMemcachedCache', '127.0.0.1:11211'),
+    'database': ('core.metrics.MetricsDatabaseCache', 'yatube_cache'),
+}
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.getenv(
+            'YATUBE_CACHE_LOCATION',
+            CACHE_BACKENDS[CACHE_BACKEND][1],
+        ),
     },
 }
 
@@ -104,6 +204,10 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+DEFAULT_FILE_STORAGE = 'core.storage.HashedFileSystemStorage'
+
+THUMBNAIL_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -117,3 +221,77 @@ CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 PAGE_SIZE = 10
 
 TRUNCATE_CHARS = 15
+
+FEED_BATCH_SIZE = 1000
+
+CURSOR_PAGINATED_VIEWS = ()
+
+POST_COUNT_TIMEOUT = 60 * 60
+
+FOLLOW_GRAPH_TIMEOUT = 60 * 60 * 24
+
+FOLLOW_GRAPH_BATCH_SIZE = 1000
+
+RECOMMENDATIONS_PER_USER = 20
+
+RECOMMENDATIONS_SHOWN = 5
+
+RECOMMENDATIONS_BATCH_SIZE = 1000
+
+RECOMMENDATION_MAX_FANOUT = 1000
+
+TRENDING_HALF_LIFE = timedelta(hours=12)
+
+TRENDING_WINDOW = timedelta(days=14)
+
+TRENDING_WEIGHTS = {
+    'post': 1,
+    'comment': 2,
+    'follow': 3,
+}
+
+TRENDING_POSTS = 100
+
+TRENDING_GROUPS = 10
+
+TRENDING_CACHE_TIMEOUT = 60
+
+# Версии страниц лежат в том же кеше. В locmem bump() одного процесса
+# не виден остальным, поэтому страницы там живут недолго.
+PAGE_CACHE_TIMEOUT = 20 if CACHE_BACKEND == 'locmem' else 60 * 60 * 24
+
+STATS_BATCH_SIZE = 1000
+
+COMMENTS_PAGE_SIZE = 20
+
+THUMBNAIL_RENDITIONS = {
+    'card': ('960x339', {'crop': 'center', 'upscale': True}),
+}
+
+IMAGE_MAX_PIXELS = 40_000_000
+
+IMAGE_MAX_SIZE = (2048, 2048)
+
+IMAGE_QUALITY = 85
+
+THUMBNAIL_WORKERS = 2
+
+POST_CARD_TIMEOUT = 60 * 60 * 24
+
+SEARCH_CONFIG = 'russian'
+
+SEARCH_BATCH_SIZE = 1000
+
+EXPORT_CHUNK_SIZE = 2000
+
+API_PAGE_SIZE = 20
+
+API_CACHE_MAX_AGE = 60
+
+# За обратным прокси на той же машине REMOTE_ADDR у всех клиентов
+# 127.0.0.1, и проверка по адресу ничего не закрывает. Тогда задайте
+# токен: /metrics/ будет отвечать только с заголовком
+# Authorization: Bearer <токен>.
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+
+METRICS_TOKEN = os.getenv('YATUBE_METRICS_TOKEN', '')